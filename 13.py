@@ -1,27 +1,82 @@
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from athlete_cache import default_source, read_index, read_store, store_path, to_frame
+from excel_export import ExcelExport
 
 # 输入文件路径
-input_file = "athletes.xlsx"  # 原始数据文件
-output_file = "processed_olympics.xlsx"  # 输出文件路径
+input_file = default_source()  # 原始数据文件（分组列式文件或 athletes.xlsx）
+output_file = "processed_olympics.xlsx"  # 只统计一个国家时的输出文件路径
+output_template = "processed_olympics_{noc}.xlsx"  # 统计多个国家时每个国家一个输出文件
+sidecar = None  # 旁路输出：None 或 'csv'/'parquet'
+# 需要统计的国家（NOC 代码），一次遍历同时生成所有国家的统计
+nocs = ['NED']
+# 并行模式：各工作表的统计分发到进程池，按原顺序收集后写出
+parallel = True
+workers = None  # 进程数，None 表示使用 CPU 核数
+chunksize = 8  # 每次分发给一个进程的工作表数
+
+# 统计用到的列
+COLUMNS = ['NOC', 'Year', 'Sport', 'Medal']
+
+# 工作进程内缓存的内存映射表（每个进程只打开一次，不复制数据）
+_tables = {}
+
+
+def summarize_medals(df, nocs):
+    """统计单个工作表中各国家按年份、项目的奖牌数，返回 {NOC: 统计表}，无获奖数据的国家不返回"""
+    medals = df.loc[df['NOC'].isin(nocs), COLUMNS].dropna()
+    # 所有国家一次分组统计，再按国家拆分；只保留该国家实际获得过的奖牌类型列
+    counts = medals.groupby(COLUMNS, observed=True).size().unstack(fill_value=0)
+    present = set(counts.index.get_level_values('NOC'))
+    summaries = {}
+    for noc in nocs:
+        if noc in present:
+            summary = counts.xs(noc, level='NOC')
+            summaries[noc] = summary.loc[:, (summary != 0).any()]
+    return summaries
+
+
+def summarize_slice(table, start, stop, nocs):
+    """只把表中 [start, stop) 行的统计列转换为 DataFrame 后统计"""
+    return summarize_medals(to_frame(table.slice(start, stop - start), COLUMNS), nocs)
+
+
+def summarize_sheet(task):
+    """工作进程：task 为 (列式文件路径, 起始行, 结束行, 国家列表)"""
+    data_path, start, stop, nocs = task
+    if data_path not in _tables:
+        _tables[data_path] = read_store(data_path)[0]
+    return summarize_slice(_tables[data_path], start, stop, nocs)
 
-# 读取 Excel 文件的所有工作表
-xls = pd.ExcelFile(input_file)
 
-# 创建一个 ExcelWriter 对象，用于写入新的 Excel 文件
-with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-    for sheet_name in xls.sheet_names:
-        # 读取当前工作表
-        df = pd.read_excel(xls, sheet_name=sheet_name)
+def iter_summaries(input_file, nocs, parallel=True, workers=None, chunksize=8):
+    """按原工作表顺序逐个返回 (工作表名, {NOC: 统计表})"""
+    data_path = store_path(input_file)
+    if not parallel:
+        table, sheets = read_store(data_path)
+        for name, start, stop in sheets:
+            yield name, summarize_slice(table, start, stop, nocs)
+        return
 
-        # 筛选荷兰（NED）的获奖数据
-        medals_ned = df[df['NOC'] == 'NED'][['Year', 'Sport', 'Medal']].dropna()
+    # 主进程只读取工作表索引；只向工作进程传递行范围，数据由各进程自行内存映射
+    sheets = read_index(data_path)
+    tasks = [(data_path, start, stop, nocs) for _, start, stop in sheets]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for (name, _, _), summaries in zip(sheets, pool.map(summarize_sheet, tasks, chunksize=chunksize)):
+            yield name, summaries
 
-        # 如果有获奖数据，进行统计
-        if not medals_ned.empty:
-            # 按年份和项目分组，统计奖牌
-            medal_summary = medals_ned.groupby(['Year', 'Sport', 'Medal']).size().unstack(fill_value=0)
 
-            # 保存到新的工作表中
-            medal_summary.to_excel(writer, sheet_name=sheet_name)
+if __name__ == "__main__":
+    # 每个国家一个输出文件，以只写模式流式写入
+    exports = {
+        noc: ExcelExport(output_file if len(nocs) == 1 else output_template.format(noc=noc), sidecar=sidecar)
+        for noc in nocs
+    }
+    for sheet_name, summaries in iter_summaries(input_file, nocs, parallel, workers, chunksize):
+        for noc, medal_summary in summaries.items():
+            # 保存到新的工作表中（年份、项目展开为前两列）
+            exports[noc].write_frame(sheet_name, medal_summary.rename_axis(columns=None), index=True)
 
-print(f"处理完成，结果已保存到 {output_file}")
\ No newline at end of file
+    for export in exports.values():
+        export.close()
+        print(f"处理完成，结果已保存到 {export.output_file}")
\ No newline at end of file
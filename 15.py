@@ -1,6 +1,8 @@
 import numpy
 import pandas
-from spsspro.algorithm import statistical_model_analysis
+
+from pca_bootstrap import bootstrap_pca, loading_table, variance_table
+
 #生成案例数据
 data = pandas.DataFrame({
     "A": numpy.random.random(size=20),
@@ -8,6 +10,7 @@ data = pandas.DataFrame({
     "C": numpy.random.random(size=20),
     "D": numpy.random.random(size=20)
 })
-#主成分分析，输入参数详细可以光标放置函数括号内按shift+tab查看，输出结果参考spsspro模板分析报告
-result = statistical_model_analysis.principal_component_analysis(data, n_factors=3)
-print(result)
\ No newline at end of file
+#主成分分析（本地计算，无需 spsspro），自助法重抽样给出载荷和方差贡献率的 95% 置信区间
+result = bootstrap_pca(data, n_components=3, n_bootstrap=1000)
+print(variance_table(result))
+print(loading_table(result, data.columns))
\ No newline at end of file
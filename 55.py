@@ -1,61 +1,108 @@
+import os
+
 import pandas as pd
+import pyarrow.feather as feather
 import re
 
-# 读取数据
-df_awards = pd.read_excel('award.xlsx', header=0)  # 确保第一行是列名
-df_events = pd.read_csv('event.csv', header=0)  # 项目历史数据
-
-# 打印列名以确保正确读取
-print("Awards DataFrame columns:", df_awards.columns)
-print("Events DataFrame columns:", df_events.columns)
+from excel_export import ExcelExport
 
-# 确保年份列是整数类型
-df_awards['年份'] = df_awards['年份'].astype(int)
-df_events['Year'] = df_events['Year'].astype(int)
+# 工作表筛选：可为名称列表或判断函数（参数为清理后的工作表名）
+# 默认保留全部；被排除的工作表既不计算也不写出
+# 如需在生成时直接跳过 de.py 中要删除的工作表，可设 exclude_sheets = de.sheets_to_delete
+include_sheets = None
+exclude_sheets = None
+# 旁路输出：None 或 'csv'/'parquet'，每个工作表另存一份到 country_awards_ratio_sheets/
+sidecar = None
+# 增量更新：设为某一年份时只重新计算该年份的行，其余年份取自上次保存的结果
+update_year = None
+state_file = 'country_awards_ratio.arrow'
 
 # 清理工作表名称中的无效字符
 def clean_sheet_name(name):
     # 替换无效字符为下划线
     return re.sub(r'[\\/*?\[\]:]', '_', name)
 
-# 创建一个新的Excel文件来存储结果
-with pd.ExcelWriter('country_awards_ratio.xlsx') as writer:
-    # 遍历每个国家
-    for country in df_awards.columns[1:]:  # 假设第一列是“年份”，其余列是国家
-        # 创建一个新的DataFrame来存储结果
-        result_df = pd.DataFrame(columns=['Year', 'Project', 'Total Golds', 'Sub Events', 'Proportion'])
-
-        # 遍历每个年份
-        for year in df_awards['年份']:
-            # 获取该年该国家的奖牌数据
-            awards_data = df_awards.loc[df_awards['年份'] == year, country].values[0] if not df_awards.loc[
-                df_awards['年份'] == year, country].empty else 0
-
-            # 遍历每个项目（假设 df_awards 的列名是项目名）
-            for project in df_events.columns[1:-3]:  # 排除 'Year', 'Total events', 'Total disciplines', 'Total sports'
-                # 获取该年该项目的子项目数量
-                sub_events = df_events.loc[df_events['Year'] == year, project].values[0] if not df_events.loc[
-                    df_events['Year'] == year, project].empty else 0
-
-                # 计算比例
-                ratio = awards_data / sub_events if sub_events > 0 else 0
-
-                # 使用 pd.concat 替代 append
-                new_row = pd.DataFrame({
-                    'Year': [year],
-                    'Project': [project],
-                    'Total Golds': [awards_data],
-                    'Sub Events': [sub_events],
-                    'Proportion': [ratio]
-                })
-                result_df = pd.concat([result_df, new_row], ignore_index=True)
-        print(country)
-        # 如果结果不为空，则写入Excel文件中的新工作表
-        if not result_df.empty:
-            # 清理工作表名称
-            sheet_name = clean_sheet_name(country)
-            result_df.to_excel(writer, sheet_name=sheet_name, index=False)
-        else:
-            print(f"警告：国家 {country} 没有数据，未生成工作表。")
-
-print("处理完成，结果已保存到 'country_awards_ratio.xlsx'")
\ No newline at end of file
+def matches(rule, name):
+    # 规则可以是名称列表或判断函数
+    return rule(name) if callable(rule) else name in rule
+
+def keep_sheet(name):
+    # 判断工作表是否需要生成
+    if include_sheets is not None and not matches(include_sheets, name):
+        return False
+    return exclude_sheets is None or not matches(exclude_sheets, name)
+
+def ratio_rows(df_awards, df_events, projects, countries):
+    # 计算给定奖牌表行对应的 (国家, 年份, 项目) 比例长表
+    # 每个年份只取第一条记录；奖牌表中有而项目表中没有的年份，子项目数记为 0
+    years = df_awards['年份'].drop_duplicates()
+    df_events = df_events.drop_duplicates('Year').set_index('Year')[projects]
+    df_events = df_events.reindex(years, fill_value=0).rename_axis('Year').reset_index()
+
+    # 奖牌表转为长表（年份 × 国家），与项目表（年份 × 项目）按年份一次合并
+    awards_long = df_awards.drop_duplicates('年份').melt(
+        id_vars='年份', value_vars=countries, var_name='Country', value_name='Total Golds'
+    )
+    events_long = df_events.melt(id_vars='Year', var_name='Project', value_name='Sub Events')
+    result = df_awards[['年份']].merge(awards_long, on='年份', how='left').merge(
+        events_long, left_on='年份', right_on='Year', how='left'
+    )
+
+    # 向量化计算比例：子项目数为 0 或缺失时比例记为 0
+    sub_events = result['Sub Events']
+    result['Proportion'] = (result['Total Golds'] / sub_events).where(sub_events > 0, 0)
+    return result[['Country', 'Year', 'Project', 'Total Golds', 'Sub Events', 'Proportion']]
+
+def update_ratio_rows(previous, df_awards, df_events, projects, countries, year):
+    # 增量更新：只取 year 年的奖牌表、项目表行计算比例，替换上次结果中该年份的行后按年份稳定排序
+    previous = previous[(previous['Year'] != year) & previous['Country'].isin(countries)]
+    updated = ratio_rows(
+        df_awards[df_awards['年份'] == year], df_events[df_events['Year'] == year], projects, countries
+    )
+    result = pd.concat([previous, updated], ignore_index=True).sort_values('Year', kind='stable')
+    return result.reset_index(drop=True)
+
+if __name__ == "__main__":
+    # 读取数据
+    df_awards = pd.read_excel('award.xlsx', header=0)  # 确保第一行是列名
+    df_events = pd.read_csv('event.csv', header=0)  # 项目历史数据
+
+    # 打印列名以确保正确读取
+    print("Awards DataFrame columns:", df_awards.columns)
+    print("Events DataFrame columns:", df_events.columns)
+
+    # 确保年份列是整数类型
+    df_awards['年份'] = df_awards['年份'].astype(int)
+    df_events['Year'] = df_events['Year'].astype(int)
+
+    # 项目列：排除 'Year', 'Total events', 'Total disciplines', 'Total sports'
+    projects = df_events.columns[1:-3]
+    countries = df_awards.columns[1:]  # 假设第一列是“年份”，其余列是国家
+    countries = [country for country in countries if keep_sheet(clean_sheet_name(country))]
+
+    if update_year is None or not os.path.exists(state_file):
+        result = ratio_rows(df_awards, df_events, projects, countries)
+    else:
+        # 其余年份的结果取自上次保存的状态文件，不重新计算
+        previous = feather.read_feather(state_file)
+        result = update_ratio_rows(previous, df_awards, df_events, projects, countries, update_year)
+    feather.write_feather(result.reset_index(drop=True), state_file)
+
+    # 按国家分组，保持“年份 → 项目”的原有行顺序
+    groups = dict(list(result.groupby('Country', sort=False)))
+
+    # 以只写模式流式写出结果
+    with ExcelExport('country_awards_ratio.xlsx', sidecar=sidecar) as export:
+        # 遍历每个国家
+        for country in countries:
+            result_df = groups.get(country, result.iloc[:0]).drop(columns='Country')
+            print(country)
+            # 如果结果不为空，则一次性写入Excel文件中的新工作表
+            if not result_df.empty:
+                # 清理工作表名称
+                sheet_name = clean_sheet_name(country)
+                export.write_frame(sheet_name, result_df)
+            else:
+                print(f"警告：国家 {country} 没有数据，未生成工作表。")
+
+    print("处理完成，结果已保存到 'country_awards_ratio.xlsx'")
\ No newline at end of file
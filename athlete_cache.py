@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# 缓存目录（按源文件哈希和修改时间区分）
+CACHE_DIR = '.athlete_cache'
+# 原始工作簿及 12.py 输出的分组列式文件
+WORKBOOK = 'athletes.xlsx'
+GROUPED_STORE = 'athletes_grouped.arrow'
+
+# 列类型：年份压缩为 int16，重复度高的文本列使用分类类型
+INT_COLUMNS = {'Year': 'int16'}
+CATEGORY_COLUMNS = ['NOC', 'Sport', 'Event', 'Medal']
+
+
+def sheet_name_for(value):
+    """12.py 中分组值对应的工作表名：截断为 31 个字符，只保留字母数字、下划线和空格"""
+    name = str(value)[:31]  # 限制工作表名称长度为31
+    return ''.join(char for char in name if char.isalnum() or char in ('_', ' '))
+
+
+def assign_sheet_names(values, counts):
+    """
+    按 12.py 的规则为重复出现（记录数大于 1）的取值依次命名工作表，名称重复时添加后缀
+    values 按首次出现顺序排列，返回 [(取值序号, 工作表名)]
+    """
+    sheet_names = {'Sheet1'}
+    named = []
+    for code in np.flatnonzero(np.asarray(counts) > 1):  # 只保留重复值
+        # 创建新的工作表，确保名称合法；名称重复时添加后缀
+        new_sheet_name = sheet_name_for(values[code])
+        counter = 1
+        original_name = new_sheet_name
+        while new_sheet_name in sheet_names:
+            new_sheet_name = f"{original_name}_{counter}"
+            counter += 1
+
+        sheet_names.add(new_sheet_name)
+        named.append((int(code), new_sheet_name))
+    return named
+
+
+def group_sheets(df):
+    """
+    按第二列（B 列）一次分组：按首次出现顺序编码，稳定排序后同一值的行连续存放
+    返回 (分组后的数据, 工作表索引)，整表作为 Sheet1，只有重复出现的值单独成表
+    """
+    codes, values = pd.factorize(df.iloc[:, 1], use_na_sentinel=False)
+    counts = np.bincount(codes, minlength=len(values))
+    order = np.argsort(codes, kind='stable')
+    stops = np.cumsum(counts)
+    starts = stops - counts
+    grouped = df.iloc[order].reset_index(drop=True)
+
+    sheets = [('Sheet1', 0, len(grouped))]
+    for code, name in assign_sheet_names(values, counts):
+        sheets.append((name, int(starts[code]), int(stops[code])))
+    return grouped, sheets
+
+
+def _source_key(path):
+    """根据源文件内容哈希和修改时间生成缓存键"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    mtime = os.stat(path).st_mtime_ns
+    return f"{digest.hexdigest()[:16]}-{mtime}"
+
+
+def _cache_path(path):
+    """返回缓存数据文件的路径"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{stem}-{_source_key(path)}.arrow")
+
+
+def _index_path(data_path):
+    """工作表索引与数据文件同名，扩展名为 .json"""
+    return os.path.splitext(data_path)[0] + '.json'
+
+
+def _apply_dtypes(df):
+    """统一列类型"""
+    for column, dtype in INT_COLUMNS.items():
+        if column in df.columns:
+            df[column] = df[column].astype(dtype)
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def _read_source(path):
+    """读取原始文件，返回 (数据, 工作表索引)；工作表索引为 [(名称, 起始行, 结束行)]"""
+    if path.endswith('.csv'):
+        frames = {os.path.splitext(os.path.basename(path))[0]: pd.read_csv(path)}
+    else:
+        frames = pd.read_excel(path, sheet_name=None)
+
+    sheets = []
+    start = 0
+    for name, df in frames.items():
+        sheets.append((name, start, start + len(df)))
+        start += len(df)
+    data = pd.concat(list(frames.values()), ignore_index=True)
+    return data, sheets
+
+
+def write_store(data, sheets, data_path):
+    """
+    将数据写为 Arrow 文件（不压缩，便于内存映射）
+    工作表索引 [(名称, 起始行, 结束行)] 写入同名 JSON 文件
+    """
+    directory = os.path.dirname(data_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = data_path + '.tmp'
+    feather.write_feather(_apply_dtypes(data), tmp_path, compression='uncompressed')
+    os.replace(tmp_path, data_path)
+    with open(_index_path(data_path), 'w', encoding='utf-8') as f:
+        json.dump([list(sheet) for sheet in sheets], f, ensure_ascii=False)
+
+
+def read_index(data_path):
+    """读取列式文件的工作表索引 [(名称, 起始行, 结束行)]"""
+    with open(_index_path(data_path), encoding='utf-8') as f:
+        return [tuple(sheet) for sheet in json.load(f)]
+
+
+def read_store(data_path):
+    """
+    以内存映射方式打开 Arrow 文件，返回 (pa.Table, 工作表索引)
+    表中的列直接引用映射的文件，不复制到内存；需要时用 to_frame 转换切片
+    """
+    table = pa.ipc.open_file(pa.memory_map(data_path, 'r')).read_all()
+    return table, read_index(data_path)
+
+
+def to_frame(table, columns=None):
+    """把表（或其切片）转换为 DataFrame 并统一列类型，columns 指定时只转换这些列"""
+    if columns is not None:
+        table = table.select(list(columns))
+    return _apply_dtypes(table.to_pandas())
+
+
+def default_source():
+    """
+    优先使用 12.py 生成的分组列式文件；不存在或比 athletes.xlsx 旧（工作簿之后重新生成过）时
+    回退到 athletes.xlsx，避免读到过期的分组数据
+    """
+    if not os.path.exists(GROUPED_STORE):
+        return WORKBOOK
+    if os.path.exists(WORKBOOK) and os.stat(WORKBOOK).st_mtime_ns > os.stat(GROUPED_STORE).st_mtime_ns:
+        return WORKBOOK
+    return GROUPED_STORE
+
+
+def store_path(path):
+    """
+    返回数据对应的列式文件路径：.arrow 文件直接返回
+    Excel/CSV 首次使用时转换为列式缓存，之后直接返回缓存路径
+    """
+    if path.endswith('.arrow'):
+        return path
+
+    data_path = _cache_path(path)
+    if not (os.path.exists(data_path) and os.path.exists(_index_path(data_path))):
+        data, sheets = _read_source(path)
+        write_store(data, sheets, data_path)
+    return data_path
+
+
+def load_sheets(path, columns=None):
+    """
+    加载运动员数据（分组列式文件、athletes.xlsx 或 summerOly_athletes.csv）
+    返回 (DataFrame, 工作表索引)；columns 指定时只转换需要的列
+    """
+    table, sheets = read_store(store_path(path))
+    return to_frame(table, columns), sheets
+
+
+def iter_sheets(path, columns=None):
+    """按原工作表顺序逐个返回 (工作表名, 数据)，每次只转换当前工作表的行"""
+    table, sheets = read_store(store_path(path))
+    for name, start, stop in sheets:
+        yield name, to_frame(table.slice(start, stop - start), columns)
\ No newline at end of file
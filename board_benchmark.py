@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import time
+
+import cv2 as cv
+import numpy as np
+
+import 识别 as detector
+
+# 合成棋盘图像的分辨率
+RESOLUTIONS = {
+    '480p': (640, 480),
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '4K': (3840, 2160),
+}
+
+
+def make_board_image(width, height, state, seed=0, noise=8):
+    """生成合成棋盘图像：暗背景上的浅色棋盘，有子的格子画深色圆"""
+    img = np.full((height, width, 3), 30, dtype=np.uint8)
+    size = int(min(width, height) * 0.6)
+    x0, y0 = (width - size) // 2, (height - size) // 2
+    cv.rectangle(img, (x0, y0), (x0 + size - 1, y0 + size - 1), (220, 220, 220), -1)
+
+    cell = size / 3
+    for i in range(3):
+        for j in range(3):
+            if state[i][j]:
+                center = (int(x0 + (j + 0.5) * cell), int(y0 + (i + 0.5) * cell))
+                cv.circle(img, center, int(cell * 0.4), (10, 10, 10), -1)
+
+    # 加入少量噪声，避免图像过于理想
+    if noise:
+        rng = np.random.default_rng(seed)
+        img = np.clip(img.astype(np.int16) + rng.integers(-noise, noise + 1, img.shape), 0, 255)
+        img = img.astype(np.uint8)
+    return img
+
+
+def generate_images(directory, count=8, seed=0):
+    """在目录下为每种分辨率生成若干张随机状态的棋盘图像，可用于离线模式"""
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    for label, (width, height) in RESOLUTIONS.items():
+        for k in range(count):
+            state = rng.integers(0, 2, (3, 3))
+            path = os.path.join(directory, f"{label}_{k:03d}.png")
+            cv.imwrite(path, make_board_image(width, height, state, seed=k))
+
+
+def time_stage(func, repeats):
+    """多次运行同一阶段，返回每次的耗时（秒）"""
+    latencies = np.empty(repeats)
+    for k in range(repeats):
+        start = time.perf_counter()
+        func()
+        latencies[k] = time.perf_counter() - start
+    return latencies
+
+
+def run_benchmark(resolutions=RESOLUTIONS, repeats=50):
+    """对各分辨率分别计时 preprocess_image、find_chessboard、get_chess_state"""
+    results = []
+    for label, (width, height) in resolutions.items():
+        img = make_board_image(width, height, np.eye(3, dtype=int))
+        _, _, rect = detector.find_chessboard(img.copy(), draw=False)
+        stages = {
+            'preprocess_image': lambda: detector.preprocess_image(img),
+            'find_chessboard': lambda: detector.find_chessboard(img, draw=False),
+            'get_chess_state': lambda: detector.get_chess_state(img, rect, show=False),
+        }
+        for stage, func in stages.items():
+            func()  # 预热
+            latencies = time_stage(func, repeats)
+            results.append({
+                'resolution': label,
+                'stage': stage,
+                'fps': repeats / latencies.sum(),
+                'p50_ms': float(np.percentile(latencies, 50) * 1000),
+                'p99_ms': float(np.percentile(latencies, 99) * 1000),
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="棋盘识别吞吐量基准测试")
+    parser.add_argument('--repeats', type=int, default=50, help="每个阶段的重复次数")
+    parser.add_argument('--output', help="把结果写入该 JSON 文件")
+    parser.add_argument('--images', metavar='DIR', help="生成合成棋盘图像到该目录后退出")
+    args = parser.parse_args()
+
+    if args.images:
+        generate_images(args.images)
+        print(f"合成图像已保存到 {args.images}")
+    else:
+        results = run_benchmark(repeats=args.repeats)
+        for row in results:
+            print(f"{row['resolution']:>6} {row['stage']:<17} {row['fps']:>9.1f} FPS  "
+                  f"p50 {row['p50_ms']:>7.2f} ms  p99 {row['p99_ms']:>7.2f} ms")
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
\ No newline at end of file
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+matplotlib.use('Agg')  # 无界面后端：只保存图片，不弹出窗口
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+# 运动员原始数据及图片输出目录
+SOURCE_FILE = 'summerOly_athletes.csv'
+CHART_DIR = 'charts'
+# 已渲染图片的内容哈希记录（图片路径 → 哈希）
+CACHE_FILE = '.render_cache.json'
+
+# 教练效应图的三个子图：(奖牌口径, 标题, 纵轴标签, 截断前的基准值)
+COACH_PANELS = [
+    ('Total', 'Total Medals', 'Medal Count', 10),
+    ('Gold', 'Gold Medal Ratio', 'Ratio', 0.5),
+    ('Silver', 'Silver Medal Ratio', 'Ratio', 0.3),
+]
+
+
+def gender_table(source=SOURCE_FILE):
+    """由运动员数据统计每届男女参赛人次及男女比例（女性为 0 时比例为 inf）"""
+    data = pd.read_csv(source, usecols=['Year', 'Sex'])
+    table = pd.crosstab(data['Year'], data['Sex']).reindex(columns=['F', 'M'], fill_value=0).astype(float)
+    with np.errstate(divide='ignore'):
+        table['Male/Female Ratio'] = table['M'] / table['F']
+    return table.rename_axis(columns=None).reset_index()
+
+
+def render_gender_counts(df, path, style):
+    """男女数量柱状图 + 男女比例折线图（双 y 轴）"""
+    sns.set_style("whitegrid")
+    fig, ax1 = plt.subplots(figsize=style.get('figsize', (14, 6)))
+
+    bar_width = style.get('bar_width', 0.6)
+    ax1.bar(df['Year'] - bar_width/2, df['F'], width=bar_width, label='Female Athletes', color='pink', alpha=0.8)
+    ax1.bar(df['Year'] + bar_width/2, df['M'], width=bar_width, label='Male Athletes', color='blue', alpha=0.8)
+    ax1.set_xlabel('Year', fontsize=14)
+    ax1.set_ylabel('Number of Athletes', fontsize=14)
+    ax1.set_title('Number of Male and Female Athletes Over Time', fontsize=16)
+
+    ax2 = ax1.twinx()
+    ax2.plot(df['Year'], df['Male/Female Ratio'], color='red', label='Male/Female Ratio', marker='o', linestyle='-', markersize=8, linewidth=2)
+    ax2.set_ylabel('Male/Female Ratio', fontsize=14)
+    ax2.set_ylim(0, style.get('ratio_max', 50))  # 限制比例范围，避免无穷大值影响
+
+    lines, labels = ax1.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax1.legend(lines + lines2, labels + labels2, loc='upper left', fontsize=12)
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=style.get('dpi', 100))
+    plt.close(fig)
+
+
+def render_gender_heatmap(df, path, style):
+    """男女数量热力图"""
+    fig = plt.figure(figsize=style.get('figsize', (14, 6)))
+    heatmap_data = df[['Year', 'F', 'M']].set_index('Year')
+    sns.heatmap(heatmap_data.T, cmap='Blues', annot=True, fmt=".0f", cbar_kws={'label': 'Number of Athletes'})
+    plt.title('Number of Male and Female Athletes Over Time (Heatmap)', fontsize=16)
+    plt.xlabel('Year', fontsize=14)
+    plt.ylabel('Athletes', fontsize=14)
+    fig.tight_layout()
+    fig.savefig(path, dpi=style.get('dpi', 100))
+    plt.close(fig)
+
+
+def render_coach_effect(effects, path, style):
+    """
+    单个国家的教练效应三联图，effects 为 {奖牌口径: {'effect', 'R2', 'MSE'}}
+    若口径含 'before'（截断前的拟合值），截断前柱高取该值，否则使用 COACH_PANELS 中的基准值
+    若口径含 'ci'（置信区间下限、上限），误差棒使用置信区间，否则使用 √MSE
+    """
+    plt.rcParams['font.sans-serif'] = style.get('fonts', ['SimHei'])
+    plt.rcParams['axes.unicode_minus'] = False
+    sns.set_theme(style="whitegrid", palette="pastel")
+
+    fig, axes = plt.subplots(1, len(COACH_PANELS), figsize=style.get('figsize', (18, 6)))
+    fig.suptitle(f"{style['country']} Coach Effect Visualization (Before and After Cutoff)", fontsize=16, y=1.05)
+
+    before_color = '#1f77b4'  # 蓝色：截断前
+    after_color = '#ff7f0e'  # 橙色：截断后
+    ci_color = '#d62728'  # 红色：置信区间
+    x = np.array([0, 1])  # 0: 截断前, 1: 截断后
+
+    for ax, (kind, title, ylabel, y_before) in zip(axes, COACH_PANELS):
+        effect = effects[kind]
+        y_before = effect.get('before', y_before)
+        y_after = y_before + effect['effect']
+        if 'ci' in effect:
+            low, high = effect['ci']
+            y_err = [[0, effect['effect'] - low], [0, high - effect['effect']]]
+        else:
+            y_err = np.sqrt(effect['MSE'])
+
+        ax.bar(x, [y_before, y_after], color=[before_color, after_color], alpha=0.6, label=['Before Cutoff', 'After Cutoff'])
+        ax.errorbar(x, [y_before, y_after], yerr=y_err, fmt='none', color=ci_color, capsize=5, label='95% Confidence Interval')
+
+        ax.set_xticks(x)
+        ax.set_xticklabels(['Before Cutoff', 'After Cutoff'])
+        ax.set_title(
+            f'{title}\nCoach Effect: {effect["effect"]:.2f}\nR²: {effect["R2"]:.2f}, MSE: {effect["MSE"]:.2f}')
+        ax.set_ylabel(ylabel)
+        ax.legend()
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=style.get('dpi', 300), bbox_inches='tight')
+    plt.close(fig)
+
+
+def content_hash(render, data, style):
+    """由绘图函数名、输入数据和样式参数计算内容哈希"""
+    digest = hashlib.sha1(render.__name__.encode())
+    if isinstance(data, pd.DataFrame):
+        digest.update(json.dumps([str(column) for column in data.columns]).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    else:
+        digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+    digest.update(json.dumps(style, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _render(task):
+    """工作进程：task 为 (绘图函数, 数据, 输出路径, 样式)"""
+    render, data, path, style = task
+    render(data, path, style)
+    return path
+
+
+def render_charts(specs, directory=CHART_DIR, workers=None):
+    """
+    并行渲染图片：specs 为 [(绘图函数, 数据, 文件名, 样式)]
+    输入数据和样式的哈希与上次渲染相同且图片仍存在时跳过，返回本次实际渲染的图片路径
+    """
+    os.makedirs(directory, exist_ok=True)
+    cache_path = os.path.join(directory, CACHE_FILE)
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+
+    tasks = []
+    hashes = {}
+    for render, data, file_name, style in specs:
+        path = os.path.join(directory, file_name)
+        hashes[path] = content_hash(render, data, style)
+        if cache.get(path) != hashes[path] or not os.path.exists(path):
+            tasks.append((render, data, path, style))
+
+    rendered = []
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path in pool.map(_render, tasks):
+                cache[path] = hashes[path]
+                rendered.append(path)
+
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    return rendered
\ No newline at end of file
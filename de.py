@@ -1,6 +1,7 @@
-import pandas as pd
 from openpyxl import load_workbook
 
+from excel_export import ExcelExport
+
 # 需要删除的工作表名称列表
 sheets_to_delete = [
     "Artistic Swimming", "Diving", "Marathon Swimming", "Swimming", "Water Polo", "Archery", "Athletics", "Badminton",
@@ -13,18 +14,54 @@ sheets_to_delete = [
     "Unnamed: 66", "Weightlifting", "Freestyle", "Greco-Roman", "Figure", "Ice Hockey"
 ]
 
-# 加载 Excel 文件
-file_path = 'country_awards_ratio.xlsx'
-wb = load_workbook(file_path)
 
-# 遍历所有工作表，删除指定名称的工作表
-for sheet_name in sheets_to_delete:
-    if sheet_name in wb.sheetnames:  # 检查工作表是否存在
-        wb.remove(wb[sheet_name])  # 删除工作表
-        print(f"已删除工作表: {sheet_name}")
-    else:
-        print(f"工作表不存在: {sheet_name}")
+def delete_sheets(file_path, sheets):
+    """加载整个工作簿，删除指定工作表后整体保存"""
+    wb = load_workbook(file_path)
+
+    # 遍历所有工作表，删除指定名称的工作表
+    for sheet_name in sheets:
+        if sheet_name in wb.sheetnames:  # 检查工作表是否存在
+            wb.remove(wb[sheet_name])  # 删除工作表
+            print(f"已删除工作表: {sheet_name}")
+        else:
+            print(f"工作表不存在: {sheet_name}")
+
+    # 保存修改后的 Excel 文件
+    wb.save(file_path)
+
 
-# 保存修改后的 Excel 文件
-wb.save(file_path)
-print(f"文件已保存: {file_path}")
\ No newline at end of file
+def copy_sheets(file_path, output_path, sheets):
+    """
+    流式模式：以只读方式打开原文件，只把保留的工作表逐行复制到新文件
+    被删除的工作表不会被解析（只复制单元格值，不复制样式）
+    """
+    source_wb = load_workbook(file_path, read_only=True)
+    skipped = set(sheets)
+
+    # ExcelExport 先写临时文件再替换，输出路径与原文件相同时也不会损坏原文件
+    with ExcelExport(output_path) as export:
+        try:
+            for sheet_name in source_wb.sheetnames:
+                if sheet_name in skipped:
+                    print(f"已跳过工作表: {sheet_name}")
+                    continue
+                export.write_rows(sheet_name, source_wb[sheet_name].iter_rows(values_only=True))
+        finally:
+            # 保存前先关闭原文件，原地替换时（Windows 下）不会因文件被占用而失败
+            source_wb.close()
+
+
+if __name__ == "__main__":
+    # 加载 Excel 文件
+    file_path = 'country_awards_ratio.xlsx'
+    # 流式模式：只复制保留的工作表，写完后替换原文件；关闭时在原文件上删除
+    stream_mode = True
+    output_path = file_path  # 与原来一样直接修改原文件，也可改为另存的新文件名
+
+    if stream_mode:
+        copy_sheets(file_path, output_path, sheets_to_delete)
+    else:
+        delete_sheets(file_path, sheets_to_delete)
+        output_path = file_path
+    print(f"文件已保存: {output_path}")
\ No newline at end of file
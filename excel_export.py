@@ -0,0 +1,147 @@
+import csv
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+# 每批追加的行数：数据按批转换后写出，内存占用与总输出量无关
+BATCH_SIZE = 5000
+# 可选的旁路输出格式
+SIDECAR_FORMATS = ('csv', 'parquet')
+
+
+def frame_rows(df, index=False, batch_size=BATCH_SIZE):
+    """
+    把 DataFrame 按批转换为行（首行为表头），缺失值转为 None
+    index=True 时把索引展开为前几列
+    """
+    if index:
+        df = df.reset_index()
+    yield [str(column) for column in df.columns]
+    for start in range(0, len(df), batch_size):
+        chunk = df.iloc[start:start + batch_size].astype(object)
+        yield from chunk.where(chunk.notna(), None).itertuples(index=False, name=None)
+
+
+def _batches(rows, batch_size):
+    """把行迭代器切分为列表批次"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _CsvSidecar:
+    """单个工作表的 CSV 旁路文件，逐批追加"""
+
+    def __init__(self, path, header):
+        self.file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(header)
+
+    def write(self, batch):
+        self.writer.writerows(batch)
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetSidecar:
+    """
+    单个工作表的 Parquet 旁路文件，每批一个行组
+    列类型由 schema 给出，不从数据推断：逐批推断的类型在后续批次中可能不同（如整数列出现小数）
+    """
+
+    def __init__(self, path, header, schema):
+        self.schema = schema
+        self.header = [str(column) for column in header]
+        self.writer = pq.ParquetWriter(path, schema)
+
+    def write(self, batch):
+        table = pa.Table.from_pandas(
+            pd.DataFrame(batch, columns=self.header), schema=self.schema, preserve_index=False
+        )
+        self.writer.write_table(table)
+
+    def close(self):
+        # 没有数据行时也得到只含表头的空文件
+        self.writer.close()
+
+
+class ExcelExport:
+    """
+    流式 Excel 导出：openpyxl 只写模式，按批追加行，不在内存中保留整个工作簿
+    sidecar 为 'csv' 或 'parquet' 时，每个工作表另存一份到 <输出文件名>_sheets/ 目录
+    """
+
+    def __init__(self, output_file, sidecar=None, batch_size=BATCH_SIZE):
+        if sidecar is not None and sidecar not in SIDECAR_FORMATS:
+            raise ValueError(f"不支持的旁路输出格式: {sidecar}")
+        self.output_file = output_file
+        self.sidecar = sidecar
+        self.batch_size = batch_size
+        self.workbook = Workbook(write_only=True)
+        self.sidecar_dir = os.path.splitext(output_file)[0] + '_sheets'
+        if sidecar is not None:
+            os.makedirs(self.sidecar_dir, exist_ok=True)
+
+    def _open_sidecar(self, sheet_name, header, schema=None):
+        if self.sidecar is None:
+            return None
+        file_name = sheet_name.replace(os.sep, '_') + '.' + self.sidecar
+        path = os.path.join(self.sidecar_dir, file_name)
+        if self.sidecar == 'csv':
+            return _CsvSidecar(path, header)
+        return _ParquetSidecar(path, header, schema)
+
+    def write_rows(self, sheet_name, rows, schema=None):
+        """
+        写出一个工作表，rows 为行的迭代器，首行为表头
+        schema 为 Parquet 旁路文件的列类型（pa.Schema），旁路输出为 Parquet 时必须给出
+        """
+        if self.sidecar == 'parquet' and schema is None:
+            raise ValueError(f"工作表 {sheet_name} 的 Parquet 旁路输出需要提供列类型 schema")
+        rows = iter(rows)
+        header = list(next(rows, []))
+        ws = self.workbook.create_sheet(title=sheet_name)
+        ws.append(header)
+        sidecar = self._open_sidecar(sheet_name, header, schema)
+        try:
+            for batch in _batches(rows, self.batch_size):
+                for row in batch:
+                    ws.append(row)
+                if sidecar is not None:
+                    sidecar.write(batch)
+        finally:
+            if sidecar is not None:
+                sidecar.close()
+
+    def write_frame(self, sheet_name, df, index=False):
+        """写出一个 DataFrame，index=True 时索引作为前几列"""
+        schema = None
+        if self.sidecar == 'parquet':
+            # Parquet 列类型取自整个 DataFrame，不依赖第一批数据（第一批全为空值的列也能确定类型）
+            schema = pa.Schema.from_pandas(df.reset_index() if index else df, preserve_index=False)
+        self.write_rows(sheet_name, frame_rows(df, index=index, batch_size=self.batch_size), schema)
+
+    def close(self):
+        """保存工作簿：先写临时文件再替换，避免中断时留下损坏的文件"""
+        if not self.workbook.worksheets:
+            # 只写模式下空工作簿无法保存，保留一个空工作表
+            self.workbook.create_sheet()
+        tmp_path = self.output_file + '.tmp'
+        self.workbook.save(tmp_path)
+        os.replace(tmp_path, self.output_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
\ No newline at end of file
@@ -3,6 +3,15 @@ import numpy as np
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
 import matplotlib.pyplot as plt
+import joblib
+
+from pca_bootstrap import bootstrap_pca, variance_table
+
+# 奖牌类型
+MEDALS = ['Gold', 'Silver', 'Bronze']
+
+# 模型文件格式版本
+MODEL_VERSION = 2
 
 # ============================
 # 数据预处理与特征工程
@@ -12,44 +21,111 @@ def load_and_preprocess_data(file_path):
     """
     加载数据并进行预处理
     """
-    # 加载数据
-    data = pd.read_csv(file_path)
+    # 加载数据（只读取需要的四列，文本列直接解析为分类类型）
+    data = pd.read_csv(
+        file_path,
+        usecols=['NOC', 'Sport', 'Year', 'Medal'],
+        dtype={
+            'NOC': 'category',
+            'Sport': 'category',
+            'Year': 'int16',
+            'Medal': 'category',
+        },
+    )
+    # 只保留三种奖牌，'No medal' 等其他取值置为缺失
+    data['Medal'] = data['Medal'].cat.set_categories(MEDALS)
+    # 分块解析得到的类别顺序不一定有序，统一按字典序排列，保证分组结果顺序不变
+    for column in ['NOC', 'Sport']:
+        data[column] = data[column].cat.reorder_categories(sorted(data[column].cat.categories))
+
+    # 奖牌独热编码后按国家(NOC)、项目(Sport)和年份(Year)一次分组求和
+    medals = pd.get_dummies(data['Medal'], dtype='int64')
+    grouped = medals.groupby(
+        [data['NOC'], data['Sport'], data['Year']], observed=True
+    ).sum()[MEDALS].reset_index()
+
+    # 计算项目总分（Gold:3, Silver:2, Bronze:1）
+    grouped['Score'] = grouped['Gold'] * 3 + grouped['Silver'] * 2 + grouped['Bronze']
 
-    # 按国家(NOC)、项目(Sport)和年份(Year)分组聚合
-    grouped = data.groupby(['NOC', 'Sport', 'Year']).agg(
-        Gold=('Medal', lambda x: (x == 'Gold').sum()),
-        Silver=('Medal', lambda x: (x == 'Silver').sum()),
-        Bronze=('Medal', lambda x: (x == 'Bronze').sum())
-    ).reset_index()
+    return grouped
+
+def grouped_from_cube(cube):
+    """
+    由奖牌计数立方体（medal_cube.MedalCube）得到与 load_and_preprocess_data 相同的分组结果
+    只保留有参赛记录的 (NOC, Sport, Year) 组合
+    """
+    # 轴顺序调整为 (NOC, Sport, Year, Medal)，非零位置即按三列字典序排列的分组
+    counts = np.asarray(cube.counts).transpose(0, 2, 1, 3)
+    noc, sport, year = np.nonzero(counts.sum(axis=3))
+    grouped = pd.DataFrame({
+        'NOC': pd.Categorical.from_codes(noc, categories=cube.labels['NOC']),
+        'Sport': pd.Categorical.from_codes(sport, categories=cube.labels['Sport']),
+        'Year': np.asarray(cube.labels['Year'], dtype=np.int16)[year],
+    })
+    for medal in MEDALS:
+        grouped[medal] = counts[noc, sport, year, cube.labels['Medal'].index(medal)].astype('int64')
 
     # 计算项目总分（Gold:3, Silver:2, Bronze:1）
     grouped['Score'] = grouped['Gold'] * 3 + grouped['Silver'] * 2 + grouped['Bronze']
 
     return grouped
 
-def build_feature_matrix(grouped):
+def feature_sums(grouped):
     """
-    构建特征矩阵
+    按 (NOC, Sport) 一次分组求届数 n 及 Σx、Σy、Σxy、Σx²、Σy²（x 为年份，y 为得分）
+    这些和可直接相加，新增一届数据时只需累加该届的和
     """
-    # 定义核心特征维度
-    features = {
-        '奖牌稳定性': lambda df: df.groupby(['NOC', 'Sport'])['Score'].std(),  # 标准差衡量稳定性
-        '时间趋势': lambda df: df.groupby(['NOC', 'Sport'])['Year'].apply(
-            lambda x: np.polyfit(x, df.loc[x.index, 'Score'], 1)[0]  # 线性趋势斜率
-        ),
-        '竞争力指数': lambda df: df.groupby(['NOC', 'Sport'])['Score'].sum() /
-                             df.groupby('NOC')['Score'].sum().max(),  # 项目贡献占比
-        '持续参赛性': lambda df: df.groupby(['NOC', 'Sport'])['Year'].nunique()  # 参赛届数
-    }
+    # 年份和得分均为整数，平方和与交叉积用 int64 计算，避免精度损失
+    x = grouped['Year'].to_numpy(dtype=np.int64)
+    y = grouped['Score'].to_numpy(dtype=np.int64)
+    return pd.DataFrame({
+        'NOC': grouped['NOC'].to_numpy(),
+        'Sport': grouped['Sport'].to_numpy(),
+        'n': 1,
+        'x': x,
+        'y': y,
+        'xy': x * y,
+        'xx': x * x,
+        'yy': y * y,
+    }).groupby(['NOC', 'Sport']).sum()
+
+def features_from_sums(sums):
+    """
+    由分组求和结果按闭式公式计算特征矩阵
+    """
+    n, sx, sy = sums['n'], sums['x'], sums['y']
+    sxy, sxx, syy = sums['xy'], sums['xx'], sums['yy']
+
+    # 标准差衡量稳定性（样本标准差，单届时为 0）
+    stability = np.sqrt((n * syy - sy * sy) / (n * (n - 1)))
+
+    # 线性趋势斜率（最小二乘）；单届时与 np.polyfit 的最小范数解一致，为 y / 2x
+    trend = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    single = n == 1
+    trend[single] = sy[single] / (2 * sx[single])
+
+    # 项目贡献占比
+    competitiveness = sy / sy.groupby(level='NOC').sum().max()
 
     # 生成特征矩阵
-    feature_matrix = pd.DataFrame()
-    for name, func in features.items():
-        feature_matrix[name] = func(grouped)
+    feature_matrix = pd.DataFrame({
+        '奖牌稳定性': stability,
+        '时间趋势': trend,
+        '竞争力指数': competitiveness,
+        '持续参赛性': n,  # 参赛届数
+    })
     feature_matrix = feature_matrix.fillna(0)
 
     return feature_matrix
 
+def build_feature_matrix(grouped):
+    """
+    构建特征矩阵
+    一次分组求 Σx、Σy、Σxy、Σx²、Σy²，由闭式公式得到全部特征
+    （grouped 中每个 (NOC, Sport, Year) 只有一行，参赛届数即行数）
+    """
+    return features_from_sums(feature_sums(grouped))
+
 # ============================
 # 主成分分析-灰色关联度融合算法
 # ============================
@@ -68,30 +144,91 @@ def pca_transform(feature_matrix):
 
     return principal_components, pca
 
-def grey_relation_coeff(reference, compared, rho=0.5):
+def grey_relation_matrix(reference, compared, rho=0.5, dtype=np.float64, chunk_size=None):
+    """
+    批量计算灰色关联度
+    reference 为 (n,) 参考序列，compared 为 (n, m) 比较序列矩阵（缺失值为 NaN，不参与计算）
+    返回每列的平均关联系数 (m,)；chunk_size 为单块最多元素数，用于限制内存
+    """
+    reference = np.asarray(reference, dtype=dtype)[:, None]
+    compared = np.asarray(compared, dtype=dtype)
+    n, m = compared.shape
+    if chunk_size is None:
+        chunk_size = max(n * m, 1)
+    col_step = max(1, min(m, chunk_size // max(n, 1)))
+    row_step = max(1, min(n, chunk_size // col_step))
+
+    grey_relations = np.empty(m, dtype=dtype)
+    for c0 in range(0, m, col_step):
+        cols = slice(c0, c0 + col_step)
+        width = min(col_step, m - c0)
+
+        # 第一遍：各列差值的最小值、最大值
+        min_delta = np.full(width, np.inf, dtype=dtype)
+        max_delta = np.full(width, -np.inf, dtype=dtype)
+        for r0 in range(0, n, row_step):
+            delta = np.abs(reference[r0:r0 + row_step] - compared[r0:r0 + row_step, cols])
+            min_delta = np.fmin(min_delta, np.fmin.reduce(delta, axis=0, initial=np.inf))
+            max_delta = np.fmax(max_delta, np.fmax.reduce(delta, axis=0, initial=-np.inf))
+
+        # 第二遍：关联系数求和、计数，得到平均关联度
+        total = np.zeros(width, dtype=dtype)
+        count = np.zeros(width, dtype=np.int64)
+        for r0 in range(0, n, row_step):
+            delta = np.abs(reference[r0:r0 + row_step] - compared[r0:r0 + row_step, cols])
+            coeff = (min_delta + rho * max_delta) / (delta + rho * max_delta)
+            total += np.nansum(coeff, axis=0, dtype=dtype)
+            count += np.count_nonzero(~np.isnan(coeff), axis=0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            grey_relations[cols] = total / count
+
+    return grey_relations
+
+def minmax_normalize(values, dtype=np.float64):
     """
-    计算灰色关联系数
+    按列极差标准化到 [0, 1]（缺失值保持为 NaN，常数列为 0）
     """
-    delta = np.abs(reference - compared)
-    min_delta = np.min(delta)
-    max_delta = np.max(delta)
-    return (min_delta + rho * max_delta) / (delta + rho * max_delta)
+    values = np.asarray(values, dtype=dtype)
+    low = np.nanmin(values, axis=0)
+    span = np.nanmax(values, axis=0) - low
+    return (values - low) / np.where(span > 0, span, 1)
 
-def calculate_grey_relations(feature_matrix):
+def calculate_grey_relations(feature_matrix, dtype=np.float64, chunk_size=None):
     """
-    计算各项目与总奖牌的灰色关联度
+    计算各项目与总奖牌的灰色关联度（按 feature_matrix.index.levels[1] 的项目顺序返回）
     """
     # 以国家总奖牌为参考序列
     national_total = feature_matrix.groupby('NOC').sum().sum(axis=1)
 
-    # 计算各项目与总奖牌的关联度
-    grey_relations = []
-    for sport in feature_matrix.index.levels[1]:
-        sport_scores = feature_matrix.xs(sport, level='Sport').sum(axis=1)
-        coeff = grey_relation_coeff(national_total, sport_scores)
-        grey_relations.append(coeff.mean())  # 取国家平均关联度
+    # 一次展开为 国家 × 项目 的稠密矩阵，未参加的项目为 NaN
+    sport_scores = feature_matrix.sum(axis=1).unstack('Sport').reindex(
+        index=national_total.index, columns=feature_matrix.index.levels[1]
+    )
+
+    # 批量计算各项目与总奖牌的关联度（取国家平均关联度）
+    grey_relations = grey_relation_matrix(
+        national_total.to_numpy(), sport_scores.to_numpy(), dtype=dtype, chunk_size=chunk_size
+    )
+
+    return grey_relations.tolist()
+
+def calculate_component_grey_relations(feature_matrix, principal_components, dtype=np.float64, chunk_size=None):
+    """
+    计算各主成分与总奖牌的灰色关联度（与 PCA 方差贡献率一一对应，用于融合权重）
+    按项目的关联度（calculate_grey_relations）长度为项目数，与按主成分的方差贡献率无法逐项融合，故融合权重按主成分计算
+    """
+    # 以每行所属国家的总奖牌为参考序列
+    national_total = feature_matrix.groupby('NOC').sum().sum(axis=1)
+    reference = national_total.reindex(feature_matrix.index.get_level_values('NOC'))
+
+    # 总奖牌与以 0 为中心的主成分得分量纲不同，先各自极差标准化到 [0, 1] 再比较
+    grey_relations = grey_relation_matrix(
+        minmax_normalize(reference.to_numpy(), dtype), minmax_normalize(principal_components, dtype),
+        dtype=dtype, chunk_size=chunk_size
+    )
 
-    return grey_relations
+    return grey_relations.tolist()
 
 def calculate_final_weights(pca, grey_relations):
     """
@@ -118,24 +255,133 @@ def calculate_sport_scores(principal_components, final_weights, feature_matrix):
     )
     return sport_scores
 
+# ============================
+# 模型持久化与增量更新
+# ============================
+
+def fit_model(grouped=None, sums=None, years=None, revision=1):
+    """
+    拟合 PCA-GRA 模型（可由预处理结果或已累加的分组求和结果拟合）
+    模型包含分组求和、标准化器、PCA、灰色关联度与融合权重
+    由分组求和结果拟合时须同时给出 years（和中不含年份信息，增量更新时据此检查重复年份）
+    """
+    if sums is None:
+        if grouped is None:
+            raise ValueError("grouped 和 sums 至少需要提供一个")
+        sums = feature_sums(grouped)
+        years = sorted(int(year) for year in grouped['Year'].unique())
+    elif years is None:
+        raise ValueError("由 sums 拟合模型时须提供 years（sums 所包含的年份）")
+    feature_matrix = features_from_sums(sums)
+
+    # 标准化 + PCA（保留85%方差）
+    scaler = StandardScaler().fit(feature_matrix)
+    pca = PCA(n_components=0.85).fit(scaler.transform(feature_matrix))
+    principal_components = pca.transform(scaler.transform(feature_matrix))
+
+    # 灰色关联度与融合权重
+    grey_relations = calculate_component_grey_relations(feature_matrix, principal_components)
+    final_weights = calculate_final_weights(pca, grey_relations)
+
+    return {
+        'version': MODEL_VERSION,
+        'revision': revision,
+        'years': list(years),
+        'sums': sums,
+        'scaler': scaler,
+        'pca': pca,
+        'grey_relations': grey_relations,
+        'final_weights': final_weights,
+    }
+
+def pca_stability(model, n_bootstrap=1000, seed=0):
+    """
+    自助法评估模型中 PCA 的稳定性：对特征矩阵重抽样，保留与模型相同的主成分个数
+    返回 pca_bootstrap.bootstrap_pca 的结果（载荷、方差贡献率及其置信区间）
+    """
+    feature_matrix = features_from_sums(model['sums'])
+    return bootstrap_pca(feature_matrix, model['pca'].n_components_, n_bootstrap=n_bootstrap, seed=seed)
+
+def update_model(model, new_grouped):
+    """
+    增量更新模型：只对新一届数据分组求和并累加到已保存的和上，再重新拟合
+    重新拟合只涉及 (NOC, Sport) 级别的特征矩阵，与历史原始数据量无关
+    """
+    new_years = sorted(int(year) for year in new_grouped['Year'].unique())
+    duplicated = set(new_years) & set(model['years'])
+    if duplicated:
+        raise ValueError(f"模型中已包含这些年份的数据: {sorted(duplicated)}")
+
+    sums = model['sums'].add(feature_sums(new_grouped), fill_value=0).astype(np.int64)
+    return fit_model(
+        sums=sums, years=sorted(model['years'] + new_years), revision=model['revision'] + 1
+    )
+
+def score_with_model(model, feature_matrix=None):
+    """
+    仅使用已拟合的标准化器和 PCA 计算综合评分（不重新拟合）
+    feature_matrix 默认为模型自身的特征矩阵，也可传入新的 (NOC, Sport) 行
+    """
+    if feature_matrix is None:
+        feature_matrix = features_from_sums(model['sums'])
+    principal_components = model['pca'].transform(model['scaler'].transform(feature_matrix))
+    return calculate_sport_scores(principal_components, model['final_weights'], feature_matrix)
+
+def save_model(model, model_file):
+    """
+    保存模型
+    """
+    joblib.dump(model, model_file)
+
+def load_model(model_file):
+    """
+    加载模型并检查格式版本
+    """
+    model = joblib.load(model_file)
+    if model.get('version') != MODEL_VERSION:
+        raise ValueError(f"模型版本不匹配: {model.get('version')}，当前版本为 {MODEL_VERSION}")
+    return model
+
 # ============================
 # 战略核心项目识别与可视化
 # ============================
 
-def identify_strategic_sports(sport_scores, country_code='CHN', top_n=5):
+def compute_sport_scores(file_path):
+    """
+    运行完整的 PCA-GRA 流程，返回所有 (NOC, Sport) 的综合评分
+    """
+    return score_with_model(fit_model(load_and_preprocess_data(file_path)))
+
+def rank_strategic_sports(sport_scores, countries='all', top_n=5):
+    """
+    批量识别多个国家的战略核心项目
+    countries 为国家代码列表或 'all'，返回 NOC、Rank、Sport、Score 四列的排名表
+    """
+    if countries != 'all':
+        sport_scores = sport_scores[sport_scores.index.get_level_values('NOC').isin(countries)]
+
+    # 一次分组取每个国家评分最高的 top_n 个项目
+    top = sport_scores.groupby(level='NOC', group_keys=False).nlargest(top_n)
+    rankings = top.rename('Score').reset_index()
+    rankings.insert(1, 'Rank', rankings.groupby('NOC').cumcount() + 1)
+
+    return rankings
+
+def identify_strategic_sports(sport_scores, country_code='CHN', top_n=5, plot=False):
     """
     识别指定国家的战略核心项目
     """
     # 获取指定国家的项目评分
     country_sports = sport_scores.xs(country_code, level='NOC').sort_values(ascending=False)[:top_n]
 
-    # 可视化
-    plt.figure(figsize=(10, 6))
-    country_sports.plot(kind='barh', color='goldenrod')
-    plt.title(f'{country_code} Strategic Core Sports Identification')
-    plt.xlabel('Comprehensive Score (PCA-GRA Fusion)')
-    plt.grid(axis='x')
-    plt.show()
+    # 可视化（默认关闭）
+    if plot:
+        plt.figure(figsize=(10, 6))
+        country_sports.plot(kind='barh', color='goldenrod')
+        plt.title(f'{country_code} Strategic Core Sports Identification')
+        plt.xlabel('Comprehensive Score (PCA-GRA Fusion)')
+        plt.grid(axis='x')
+        plt.show()
 
     return country_sports
 
@@ -146,22 +392,22 @@ def identify_strategic_sports(sport_scores, country_code='CHN', top_n=5):
 if __name__ == "__main__":
     # 数据文件路径
     file_path = 'summerOly_athletes.csv'
-
-    # 数据预处理与特征工程
-    grouped_data = load_and_preprocess_data(file_path)
-    feature_matrix = build_feature_matrix(grouped_data)
-
-    # 主成分分析（PCA）降维
-    principal_components, pca = pca_transform(feature_matrix)
-
-    # 计算灰色关联度
-    grey_relations = calculate_grey_relations(feature_matrix)
-
-    # 计算融合权重
-    final_weights = calculate_final_weights(pca, grey_relations)
-
-    # 计算项目综合评分
-    sport_scores = calculate_sport_scores(principal_components, final_weights, feature_matrix)
-
-    # 识别并可视化战略核心项目
-    identify_strategic_sports(sport_scores, country_code='CHN', top_n=5)
\ No newline at end of file
+    # 需要排名的国家：'all' 或国家代码列表，如 ['CHN', 'USA']
+    countries = 'all'
+    # 排名结果输出文件
+    output_file = 'strategic_sports_ranking.xlsx'
+    # 模型文件；新一届数据到来时可用 update_model 增量更新，无需重读全部历史
+    model_file = 'pca_gra_model.joblib'
+
+    # 完整流程只运行一次，所有国家共用同一份项目综合评分
+    model = fit_model(load_and_preprocess_data(file_path))
+    save_model(model, model_file)
+    sport_scores = score_with_model(model)
+
+    # PCA 稳定性诊断：方差贡献率的自助法置信区间
+    print(variance_table(pca_stability(model)))
+
+    # 批量识别战略核心项目并写入单个文件
+    rankings = rank_strategic_sports(sport_scores, countries=countries, top_n=5)
+    rankings.to_excel(output_file, index=False)
+    print(f"战略核心项目排名已保存到 {output_file}")
\ No newline at end of file
@@ -0,0 +1,140 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from athlete_cache import read_store, store_path, to_frame
+
+# 原始运动员数据及计数立方体的保存目录
+SOURCE_FILE = 'summerOly_athletes.csv'
+CUBE_DIR = '.medal_cube'
+# 立方体各维度（顺序即数组轴的顺序）
+DIMS = ['NOC', 'Year', 'Sport', 'Medal']
+# 奖牌维度的取值：未获奖的参赛记录计入 'No medal'，便于区分“参赛未获奖”和“未参赛”
+MEDAL_LABELS = ['Gold', 'Silver', 'Bronze', 'No medal']
+
+
+def build_cube(source=SOURCE_FILE, directory=CUBE_DIR):
+    """
+    由运动员数据一次构建 NOC × Year × Sport × Medal 计数立方体
+    计数数组保存为 counts.npy，各维度的编码字典保存为 codes.json
+    """
+    table, sheets = read_store(store_path(source))
+    # 列式文件中第一个工作表即完整数据，只转换该工作表的立方体维度列
+    _, start, stop = sheets[0]
+    data = to_frame(table.slice(start, stop - start), DIMS)
+
+    codes = []
+    labels = {}
+    for dim in DIMS[:-1]:
+        dim_codes, values = pd.factorize(data[dim], sort=True)
+        codes.append(dim_codes)
+        labels[dim] = [value.item() if hasattr(value, 'item') else value for value in values]
+    medal_codes = pd.Index(MEDAL_LABELS[:-1]).get_indexer(data['Medal'])
+    codes.append(np.where(medal_codes < 0, len(MEDAL_LABELS) - 1, medal_codes))
+    labels['Medal'] = MEDAL_LABELS
+
+    # NOC、年份或项目缺失的记录编码为 -1，无法放入立方体，与 groupby 一样不计入
+    valid = np.logical_and.reduce([dim_codes >= 0 for dim_codes in codes])
+    shape = tuple(len(labels[dim]) for dim in DIMS)
+    flat = np.ravel_multi_index([dim_codes[valid] for dim_codes in codes], shape)
+    counts = np.bincount(flat, minlength=np.prod(shape))
+    counts = counts.reshape(shape).astype(np.int32)
+
+    # 先写临时文件再替换，避免读取到写了一半的立方体
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, 'counts.tmp.npy')
+    np.save(tmp_path, counts)
+    os.replace(tmp_path, os.path.join(directory, 'counts.npy'))
+    with open(os.path.join(directory, 'codes.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'source': os.path.abspath(source),
+            'mtime': os.stat(source).st_mtime_ns,
+            'dims': DIMS,
+            'labels': labels,
+        }, f, ensure_ascii=False)
+    return MedalCube(counts, labels)
+
+
+def load_cube(source=SOURCE_FILE, directory=CUBE_DIR):
+    """加载计数立方体（内存映射）；不存在或源文件已修改时重新构建"""
+    codes_path = os.path.join(directory, 'codes.json')
+    if os.path.exists(codes_path):
+        with open(codes_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['source'] == os.path.abspath(source) and meta['mtime'] == os.stat(source).st_mtime_ns:
+            counts = np.load(os.path.join(directory, 'counts.npy'), mmap_mode='r')
+            return MedalCube(counts, meta['labels'])
+    return build_cube(source, directory)
+
+
+class MedalCube:
+    """
+    奖牌计数立方体：counts[NOC, Year, Sport, Medal] 为对应的参赛记录数
+    查询参数名为小写维度名，取值为单个标签或标签列表，例如：
+        cube.sum(noc='NED', by=['Year', 'Sport'])
+        cube.sum(medal=['Gold', 'Silver', 'Bronze'], by='NOC')
+    """
+
+    def __init__(self, counts, labels):
+        self.counts = counts
+        self.labels = {dim: list(labels[dim]) for dim in DIMS}
+        self._index = {dim: {label: i for i, label in enumerate(values)} for dim, values in self.labels.items()}
+
+    def _codes(self, dim, value):
+        """把标签（或标签列表）转为编码数组，不存在的标签抛出 KeyError"""
+        values = value if isinstance(value, (list, tuple, np.ndarray, pd.Index)) else [value]
+        try:
+            return np.array([self._index[dim][v] for v in values], dtype=np.intp)
+        except KeyError as e:
+            raise KeyError(f"{dim} 中不存在 {e.args[0]!r}") from None
+
+    def select(self, **filters):
+        """按条件切片，返回 (子数组, 各维度标签)；未指定的维度保留全部"""
+        unknown = set(filters) - {dim.lower() for dim in DIMS}
+        if unknown:
+            raise ValueError(f"未知的维度: {sorted(unknown)}")
+
+        array = self.counts
+        labels = {}
+        for axis, dim in enumerate(DIMS):
+            value = filters.get(dim.lower())
+            if value is None:
+                labels[dim] = self.labels[dim]
+                continue
+            codes = self._codes(dim, value)
+            array = np.take(array, codes, axis=axis)
+            labels[dim] = [self.labels[dim][code] for code in codes]
+        return array, labels
+
+    def reduce(self, by=None, **filters):
+        """按条件切片后，对 by 以外的维度求和，返回 (数组, by 各维度标签)；数组轴按 by 的顺序排列"""
+        by = [by] if isinstance(by, str) else list(by or [])
+        array, labels = self.select(**filters)
+        axes = [DIMS.index(dim) for dim in by]
+        summed = array.sum(axis=tuple(axis for axis in range(len(DIMS)) if axis not in axes))
+        # 求和后剩余轴按 DIMS 顺序排列，再调整为 by 的顺序
+        summed = np.moveaxis(summed, np.argsort(np.argsort(axes)), range(len(axes))) if axes else summed
+        return summed, [labels[dim] for dim in by]
+
+    def sum(self, by=None, dropna=True, **filters):
+        """
+        按条件汇总：by 为空时返回总数，否则返回以 by 为索引的 Series
+        dropna=True 时去掉计数为 0 的组合
+        """
+        summed, labels = self.reduce(by, **filters)
+        if not labels:
+            return int(summed)
+        by = [by] if isinstance(by, str) else list(by)
+        index = pd.MultiIndex.from_product(labels, names=by) if len(by) > 1 else pd.Index(labels[0], name=by[0])
+        result = pd.Series(np.asarray(summed).ravel(), index=index, name='Count')
+        return result[result > 0] if dropna else result
+
+
+if __name__ == "__main__":
+    cube = load_cube()
+    print(f"立方体形状: {dict(zip(DIMS, cube.counts.shape))}")
+    # 示例：荷兰（NED）按年份、项目统计的奖牌数
+    medals = cube.sum(noc='NED', medal=MEDAL_LABELS[:-1], by=['Year', 'Sport', 'Medal'])
+    print(medals.unstack(fill_value=0))
\ No newline at end of file
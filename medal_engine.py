@@ -0,0 +1,244 @@
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from athlete_cache import assign_sheet_names, default_source, read_store, store_path, to_frame
+from excel_export import ExcelExport
+
+# 奖牌类型（顺序即统计数组最后一维的顺序）
+MEDALS = ['Gold', 'Silver', 'Bronze']
+
+# 各统计口径的合计列名
+TOTAL_LABELS = {
+    'Total': '总奖牌数',
+    'Gold': '总金牌数',
+    'Silver': '总银牌数',
+    'Bronze': '总铜牌数',
+}
+
+# 统计数组的保存文件，增量更新时在此基础上修改
+STATE_FILE = 'medal_counts.npz'
+
+# 默认输出文件
+DEFAULT_OUTPUTS = {
+    'Total': 'medal_count_by_year.xlsx',
+    'Gold': 'gold_medal_count_by_year.xlsx',
+    'Silver': 'silver_medal_count_by_year.xlsx',
+    'Bronze': 'bronze_medal_count_by_year.xlsx',
+}
+
+
+def count_medals(data, sheets):
+    """
+    一次向量化统计所有工作表的奖牌数
+    返回 (counts, years, events)，counts 形状为 (工作表, 年份, 项目, 奖牌类型)
+    """
+    year_codes, years = pd.factorize(data['Year'], sort=True)
+    event_codes, events = pd.factorize(data['Sport'], sort=True)
+    medal_codes = pd.Index(MEDALS).get_indexer(data['Medal'])
+    years = np.asarray(years)
+    events = np.asarray(events, dtype=object)
+
+    # 各工作表的行号及其所属工作表编号
+    rows = np.concatenate([np.arange(start, stop) for _, start, stop in sheets])
+    sheet_codes = np.repeat(np.arange(len(sheets)), [stop - start for _, start, stop in sheets])
+
+    # 运动项目为空或奖牌类型无效的行不计数
+    year_codes, event_codes, medal_codes = year_codes[rows], event_codes[rows], medal_codes[rows]
+    valid = (event_codes >= 0) & (medal_codes >= 0)
+    empty_events = np.flatnonzero(events == '')
+    if len(empty_events):
+        valid &= ~np.isin(event_codes, empty_events)
+
+    shape = (len(sheets), len(years), len(events), len(MEDALS))
+    flat = np.ravel_multi_index(
+        (sheet_codes[valid], year_codes[valid], event_codes[valid], medal_codes[valid]), shape
+    )
+    counts = np.bincount(flat, minlength=np.prod(shape)).reshape(shape)
+    return counts, years, events
+
+
+def count_values(data, keys):
+    """
+    按分组键（12.py 划分工作表所用的第二列取值，统一转为字符串）统计
+    返回 (values, rows, counts, years, events)：values 按首次出现顺序排列，
+    rows 为各取值在各年份的记录数 (取值, 年份)，counts 形状为 (取值, 年份, 项目, 奖牌类型)
+    """
+    codes, values = pd.factorize(np.asarray(keys).astype(str))
+    sizes = np.bincount(codes, minlength=len(values))
+    stops = np.cumsum(sizes)
+    groups = [(value, int(stop - size), int(stop)) for value, size, stop in zip(values, sizes, stops)]
+    counts, years, events = count_medals(data.iloc[np.argsort(codes, kind='stable')], groups)
+
+    rows = np.zeros((len(values), len(years)), dtype=np.int64)
+    np.add.at(rows, (codes, np.searchsorted(years, data['Year'].to_numpy())), 1)
+    return values.tolist(), rows, counts, years, events
+
+
+def value_sheets(values, rows):
+    """按 12.py 的规则由各取值的记录数得到工作表划分：返回 [(工作表名, 取值序号)]，Sheet1 的序号为 None"""
+    return [('Sheet1', None)] + [(name, code) for code, name in assign_sheet_names(values, rows.sum(axis=1))]
+
+
+def sheet_counts(counts, layout):
+    """由各取值的统计数组得到各工作表的统计数组：Sheet1 为所有取值之和"""
+    return np.stack([counts.sum(axis=0) if code is None else counts[code] for _, code in layout])
+
+
+def save_counts(state_file, counts, rows, years, events, values):
+    """保存按取值的统计数组、记录数及各维度标签，供增量更新使用"""
+    tmp_path = state_file + '.tmp.npz'
+    np.savez(
+        tmp_path, counts=counts, rows=rows, years=np.asarray(years),
+        events=np.asarray(events, dtype=str), values=np.asarray(values, dtype=str),
+    )
+    os.replace(tmp_path, state_file)
+
+
+def load_counts(state_file):
+    """读取 save_counts 保存的 (counts, rows, years, events, values)"""
+    with np.load(state_file) as state:
+        if 'values' not in state.files:
+            raise ValueError(f"{state_file} 是旧格式的状态文件，请先用 build_medal_workbooks 重新生成")
+        return (
+            state['counts'], state['rows'], state['years'],
+            state['events'].astype(object), state['values'].tolist(),
+        )
+
+
+def merge_counts(counts, rows, years, events, delta, delta_rows, delta_years, delta_events):
+    """
+    把新统计结果并入已有统计数组：delta 中出现的年份整体替换（重复导入同一届结果不会重复计数）
+    新年份、新项目按顺序插入对应位置，与整体重新统计的结果一致；各取值的记录数 rows 同样按年份替换
+    """
+    events = np.asarray(events, dtype=str)
+    delta_events = np.asarray(delta_events, dtype=str)
+    all_years = np.union1d(years, delta_years)
+    all_events = np.union1d(events, delta_events)
+    groups = np.arange(counts.shape[0])
+    year_positions = np.searchsorted(all_years, years)
+
+    # 出现新年份或新项目时才重新分配数组，否则直接原地修改
+    if len(all_years) != len(years) or len(all_events) != len(events):
+        merged = np.zeros((len(groups), len(all_years), len(all_events), len(MEDALS)), dtype=counts.dtype)
+        merged[np.ix_(groups, year_positions, np.searchsorted(all_events, events))] = counts
+        counts = merged
+    if len(all_years) != len(years):
+        merged_rows = np.zeros((len(groups), len(all_years)), dtype=rows.dtype)
+        merged_rows[:, year_positions] = rows
+        rows = merged_rows
+
+    year_index = np.searchsorted(all_years, delta_years)
+    counts[:, year_index] = 0
+    counts[np.ix_(groups, year_index, np.searchsorted(all_events, delta_events))] = delta
+    rows[:, year_index] = delta_rows
+    return counts, rows, all_years, all_events.astype(object)
+
+
+def medal_matrices(counts):
+    """由统计数组得到金、银、铜及总奖牌数的 (工作表, 年份, 项目) 矩阵"""
+    matrices = {medal: counts[..., i] for i, medal in enumerate(MEDALS)}
+    matrices['Total'] = counts.sum(axis=3)
+    return matrices
+
+
+def sheet_rows(matrix, years, events, total_label):
+    """生成单个工作表的所有行：只保留有奖牌的年份和项目，末列为合计"""
+    year_mask = matrix.sum(axis=1) > 0
+    event_mask = matrix.sum(axis=0) > 0
+    values = matrix[year_mask][:, event_mask]
+
+    yield ['年份', *events[event_mask].tolist(), total_label]
+    body = np.column_stack([years[year_mask], values, values.sum(axis=1)])
+    yield from body.tolist()
+
+
+def write_medal_workbook(output_file, sheet_names, matrices, years, events, total_label, sidecar=None):
+    """以只写（流式）模式写出统计结果，sidecar 为 'csv'/'parquet' 时另存每个工作表"""
+    with ExcelExport(output_file, sidecar=sidecar) as export:
+        for sheet_name, matrix in zip(sheet_names, matrices):
+            rows = sheet_rows(matrix, years, events, total_label)
+            # 年份、各项目计数与合计都是整数
+            header = next(rows)
+            schema = pa.schema([(name, pa.int64()) for name in header])
+            export.write_rows(sheet_name, itertools.chain([header], rows), schema)
+
+
+def write_outputs(outputs, counts, years, events, sheet_names, sidecar=None):
+    """由统计数组写出各统计口径的工作簿"""
+    matrices = medal_matrices(counts)
+    for kind, output_file in outputs.items():
+        write_medal_workbook(
+            output_file, sheet_names, matrices[kind], years, events, TOTAL_LABELS[kind], sidecar
+        )
+        print(f"按年份统计的奖牌结果（{kind}）已保存到 {output_file}")
+
+
+def build_medal_workbooks(source_file, outputs, sidecar=None, state_file=STATE_FILE):
+    """
+    单次读取、单次统计，同时生成多个奖牌统计文件
+    outputs 为 {统计口径: 输出文件}，统计口径为 Total/Gold/Silver/Bronze
+    工作表按 12.py 的规则划分时，先按第二列取值统计，各工作表的统计由取值的统计得到；
+    state_file 不为 None 时保存按取值的统计，之后新一届结果可用 update_medal_workbooks 增量并入
+    """
+    table, sheets = read_store(store_path(source_file))
+    key = table.column_names[1]
+    data = to_frame(table, dict.fromkeys([key, 'Year', 'Sport', 'Medal']))
+    sheet_names = [name for name, _, _ in sheets]
+
+    # 第一个工作表即完整数据
+    _, start, stop = sheets[0]
+    full = data.iloc[start:stop]
+    values, rows, value_counts, years, events = count_values(full, full[key])
+    layout = value_sheets(values, rows)
+    if [name for name, _ in layout] == sheet_names:
+        counts = sheet_counts(value_counts, layout)
+        if state_file is not None:
+            save_counts(state_file, value_counts, rows, years, events, values)
+    else:
+        # 工作表不是 12.py 的划分方式：逐工作表统计，无法增量更新
+        if state_file is not None:
+            print(f"警告：{source_file} 的工作表划分与 12.py 不一致，未保存增量更新状态")
+        counts, years, events = count_medals(data, sheets)
+    write_outputs(outputs, counts, years, events, sheet_names, sidecar)
+
+
+def update_medal_workbooks(new_rows, outputs, sidecar=None, state_file=STATE_FILE):
+    """
+    增量更新：只统计新一届（或几届）的运动员记录并并入已保存的统计，不重新读取历史数据
+    new_rows 与 summerOly_athletes.csv 列结构相同，须包含所涉及年份的全部记录
+    新记录按第二列取值并入对应取值的统计，工作表划分由合并后各取值的记录数按 12.py 的规则重新得到：
+    更新后才重复出现的取值会连同历史记录新增工作表，结果与把新记录追加到原数据末尾后整体重新统计一致
+    """
+    counts, rows, years, events, values = load_counts(state_file)
+    new_values, delta_rows, delta, delta_years, delta_events = count_values(new_rows, new_rows.iloc[:, 1])
+
+    # 新出现的取值按首次出现顺序追加在已有取值之后
+    known = set(values)
+    values = values + [value for value in new_values if value not in known]
+    index = pd.Index(values).get_indexer(new_values)
+    padding = len(values) - len(counts)
+    counts = np.concatenate([counts, np.zeros((padding,) + counts.shape[1:], dtype=counts.dtype)])
+    rows = np.concatenate([rows, np.zeros((padding, rows.shape[1]), dtype=rows.dtype)])
+    value_delta = np.zeros((len(values),) + delta.shape[1:], dtype=counts.dtype)
+    value_delta[index] = delta
+    value_delta_rows = np.zeros((len(values), len(delta_years)), dtype=rows.dtype)
+    value_delta_rows[index] = delta_rows
+
+    counts, rows, years, events = merge_counts(
+        counts, rows, years, events, value_delta, value_delta_rows, delta_years, delta_events
+    )
+    save_counts(state_file, counts, rows, years, events, values)
+    layout = value_sheets(values, rows)
+    write_outputs(outputs, sheet_counts(counts, layout), years, events, [name for name, _ in layout], sidecar)
+
+
+if __name__ == "__main__":
+    # 一次生成总奖牌数和金牌数两个统计文件
+    build_medal_workbooks(default_source(), {
+        'Total': DEFAULT_OUTPUTS['Total'],
+        'Gold': DEFAULT_OUTPUTS['Gold'],
+    })
\ No newline at end of file
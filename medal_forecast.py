@@ -0,0 +1,179 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 各国奖牌榜数据
+MEDAL_COUNTS_FILE = 'summerOly_medal_counts.csv'
+# 预测目标（顺序即数组第一维的顺序）
+TARGETS = ['Gold', 'Total']
+# 历届东道主（国家名与奖牌榜一致），用于东道主效应
+HOSTS = {
+    1896: 'Greece', 1900: 'France', 1904: 'United States', 1908: 'Great Britain', 1912: 'Sweden',
+    1920: 'Belgium', 1924: 'France', 1928: 'Netherlands', 1932: 'United States', 1936: 'Germany',
+    1948: 'Great Britain', 1952: 'Finland', 1956: 'Australia', 1960: 'Italy', 1964: 'Japan',
+    1968: 'Mexico', 1972: 'West Germany', 1976: 'Canada', 1980: 'Soviet Union', 1984: 'United States',
+    1988: 'South Korea', 1992: 'Spain', 1996: 'United States', 2000: 'Australia', 2004: 'Greece',
+    2008: 'China', 2012: 'Great Britain', 2016: 'Brazil', 2020: 'Japan', 2024: 'France',
+    2028: 'United States', 2032: 'Australia',
+}
+# 东道主效应只用该年份及之后的届次估计（更早的届次受抵制和参赛规模影响，倍数失真）
+HOST_SINCE = 1988
+# 近期权重的半衰期（届数）：越近的届次权重越大，趋势主要反映近期走势
+HALF_LIFE = 3
+# 只预测最近若干届内上过奖牌榜的国家
+RECENT_GAMES = 3
+# 模拟次数、预测区间水平
+N_SIMULATIONS = 2000
+INTERVAL = 0.9
+
+
+def load_counts(file_path=MEDAL_COUNTS_FILE):
+    """
+    读取奖牌榜并整理为稠密数组：返回 (countries, years, counts, active)
+    counts 形状为 (目标, 国家, 年份)，未上榜记为 0；active 标记国家首次上榜及之后的年份
+    """
+    data = pd.read_csv(file_path)
+    data['NOC'] = data['NOC'].str.strip()  # 部分国家名带有多余空格
+    country_codes, countries = pd.factorize(data['NOC'], sort=True)
+    year_codes, years = pd.factorize(data['Year'], sort=True)
+
+    counts = np.zeros((len(TARGETS), len(countries), len(years)))
+    for i, target in enumerate(TARGETS):
+        np.add.at(counts[i], (country_codes, year_codes), data[target].to_numpy())
+    listed = np.zeros((len(countries), len(years)), dtype=bool)
+    listed[country_codes, year_codes] = True
+    active = np.cumsum(listed, axis=1) > 0
+    return np.asarray(countries, dtype=object), np.asarray(years), counts, active
+
+
+def host_mask(countries, years):
+    """(国家, 年份) 布尔数组：该国是否为该届东道主"""
+    return np.array([[HOSTS.get(year) == country for year in years] for country in countries])
+
+
+def host_factor(counts, host, years, origin):
+    """
+    东道主效应（各目标一个倍数）：HOST_SINCE 以来历届东道主当届奖牌数与其前后两届均值之比的中位数
+    所有国家共用，避免单个国家只有一两次东道主经历时估计不稳定
+    """
+    before = np.concatenate([counts[..., :1], counts[..., :-1]], axis=-1)
+    after = np.concatenate([counts[..., 1:], counts[..., -1:]], axis=-1)
+    baseline = (before + after) / 2
+    years = np.asarray(years)
+    usable = host & (years >= HOST_SINCE) & (years < origin) & (baseline > 0).all(axis=0)
+    if not usable.any():
+        return np.ones(len(counts))
+    return np.array([np.median(counts[i][usable] / baseline[i][usable]) for i in range(len(counts))])
+
+
+def design_matrix(years, origin):
+    """设计矩阵 (年份, 2)：截距、距预测起点的届数"""
+    t = (np.asarray(years, dtype=float) - origin) / 4.0
+    return np.stack([np.ones_like(t), t], axis=-1)
+
+
+def fit(X, y, weights):
+    """
+    所有国家、所有目标一次加权最小二乘（堆叠伪逆，等价于逐个 lstsq 的最小范数解）
+    X: (年份, p)；y: (目标, 国家, 年份)；weights: (国家, 年份)
+    返回 (系数 (目标, 国家, p), 残差标准差 (目标, 国家), 协方差因子 (国家, p, p))
+    """
+    sqrt_w = np.sqrt(weights)
+    Xw = X[None] * sqrt_w[..., None]
+    beta = np.einsum('ckj,ocj->ock', np.linalg.pinv(Xw), y * sqrt_w)
+
+    # 残差方差按有效样本量校正；只有一届有效数据的国家按秩计参数个数
+    residuals = (y - np.einsum('jk,ock->ocj', X, beta)) * sqrt_w
+    n_eff = weights.sum(axis=1) ** 2 / np.maximum((weights ** 2).sum(axis=1), 1e-12)
+    n_params = np.linalg.matrix_rank(Xw)
+    dof = np.maximum(n_eff - n_params, 1)
+    sigma = np.sqrt((residuals ** 2).sum(axis=2) / weights.sum(axis=1).clip(1e-12) * n_eff / dof)
+    return beta, sigma, np.linalg.pinv(np.einsum('cjk,cjl->ckl', Xw, Xw))
+
+
+def recency_weights(years, origin, active, host, half_life=HALF_LIFE):
+    """
+    起点及之前的年份按距起点的届数指数衰减加权
+    起点之后、首次上榜之前及作为东道主的年份权重为 0（东道主效应单独估计）
+    """
+    age = (origin - np.asarray(years, dtype=float)) / 4.0
+    weights = np.where(age >= 0, 0.5 ** (age / half_life), 0.0)
+    return weights[None, :] * (active & ~host)
+
+
+def forecast_arrays(countries, years, counts, active, year, n_simulations=N_SIMULATIONS,
+                    interval=INTERVAL, seed=0, half_life=HALF_LIFE):
+    """
+    用 year 之前的数据拟合并预测 year 届：返回 (点预测, 区间下限, 区间上限)，形状均为 (目标, 国家)
+    预测区间由模拟得到：正态误差方差 = σ²(1 + x₀ᵀ(XᵀWX)⁺x₀)，东道主再乘以东道主效应，结果截断为非负
+    """
+    origin = years[years < year].max()
+    host = host_mask(countries, years)
+    X = design_matrix(years, origin)
+    beta, sigma, cov = fit(X, counts, recency_weights(years, origin, active, host, half_life))
+
+    x0 = design_matrix([year], origin)[0]
+    multiplier = np.where(host_mask(countries, [year])[:, 0], host_factor(counts, host, years, origin)[:, None], 1.0)
+    point = np.einsum('k,ock->oc', x0, beta) * multiplier
+    scale = sigma * np.sqrt(1 + np.einsum('k,ckl,l->c', x0, cov, x0)) * multiplier
+
+    rng = np.random.default_rng(seed)
+    draws = np.maximum(point + scale * rng.standard_normal((n_simulations,) + point.shape), 0)
+    alpha = (1 - interval) / 2
+    low, high = np.quantile(draws, [alpha, 1 - alpha], axis=0)
+    return np.maximum(point, 0), low, high
+
+
+def forecast(year=2028, file_path=MEDAL_COUNTS_FILE, n_simulations=N_SIMULATIONS,
+             interval=INTERVAL, seed=0, recent_games=RECENT_GAMES):
+    """预测 year 届各国金牌数和奖牌总数，返回按金牌、总数降序排列的表"""
+    countries, years, counts, active = load_counts(file_path)
+    point, low, high = forecast_arrays(countries, years, counts, active, year, n_simulations, interval, seed)
+
+    result = pd.DataFrame({'NOC': countries})
+    for i, target in enumerate(TARGETS):
+        result[target] = point[i]
+        result[f'{target}_low'] = low[i]
+        result[f'{target}_high'] = high[i]
+    # 只保留最近若干届上过奖牌榜的国家
+    recent = (counts[1][:, -recent_games:] > 0).any(axis=1)
+    return result[recent].sort_values(['Gold', 'Total'], ascending=False).reset_index(drop=True)
+
+
+def _backtest_origin(task):
+    """工作进程：用 year 之前的数据预测 year 届，返回该届各目标的误差指标"""
+    countries, years, counts, active, year, n_simulations, interval = task
+    point, low, high = forecast_arrays(countries, years, counts, active, year, n_simulations, interval)
+    j = np.searchsorted(years, year)
+    actual = counts[:, :, j]
+    listed = active[:, j - 1]  # 只评估预测起点时已上过奖牌榜的国家
+    errors = (point - actual)[:, listed]
+    covered = ((actual >= low) & (actual <= high))[:, listed]
+    return [
+        {
+            'Year': int(year), 'Target': target,
+            'MAE': float(np.abs(errors[i]).mean()),
+            'RMSE': float(np.sqrt((errors[i] ** 2).mean())),
+            'Coverage': float(covered[i].mean()),
+        }
+        for i, target in enumerate(TARGETS)
+    ]
+
+
+def backtest(file_path=MEDAL_COUNTS_FILE, origins=6, n_simulations=N_SIMULATIONS,
+             interval=INTERVAL, workers=None):
+    """滚动起点回测：依次预测最近 origins 届，各届在进程池中并行计算"""
+    countries, years, counts, active = load_counts(file_path)
+    tasks = [(countries, years, counts, active, year, n_simulations, interval) for year in years[-origins:]]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = [row for rows in pool.map(_backtest_origin, tasks) for row in rows]
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(backtest().to_string(index=False))
+    predictions = forecast(2028)
+    predictions.to_csv('medal_forecast_2028.csv', index=False)
+    print(predictions.head(20).round(1).to_string(index=False))
+    print("2028 年预测结果已保存到 medal_forecast_2028.csv")
\ No newline at end of file
@@ -0,0 +1,207 @@
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import high
+from athlete_cache import group_sheets
+from medal_engine import count_medals, medal_matrices, write_medal_workbook, TOTAL_LABELS
+
+# 真实数据规模（summerOly_athletes.csv 约 25 万行，234 个代表团）
+ATHLETE_ROWS = 252565
+NUM_NOCS = 234
+NUM_SPORTS = 72
+EVENTS_PER_SPORT = 14
+YEARS = [1896, 1900, 1904, 1908, 1912, 1920, 1924, 1928, 1932, 1936, 1948, 1952, 1956, 1960, 1964,
+         1968, 1972, 1976, 1980, 1984, 1988, 1992, 1996, 2000, 2004, 2008, 2012, 2016, 2020, 2024]
+# 奖牌分布（约 86% 的参赛记录未获奖）
+MEDAL_VALUES = ['Gold', 'Silver', 'Bronze', 'No medal']
+MEDAL_PROBABILITIES = [0.047, 0.046, 0.047, 0.86]
+# 默认测试的数据规模倍数；100 倍（约 2500 万行、数 GB 临时 CSV）需用 --scales 显式指定
+SCALES = [1, 10]
+
+
+def load_script(file_name):
+    """按文件路径导入以数字命名的脚本（脚本主体在 __main__ 中，导入时只定义函数）"""
+    name = 'script_' + os.path.splitext(file_name)[0]
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_athletes(scale=1, seed=0):
+    """
+    生成与 summerOly_athletes.csv 列结构相同的合成数据（第二列为 NOC，供 12.py 分组）
+    文本列用分类类型，100 倍规模时内存也可控
+    """
+    rng = np.random.default_rng(seed)
+    rows = ATHLETE_ROWS * scale
+    nocs = [f'N{i:03d}' for i in range(NUM_NOCS)]
+    sports = [f'Sport {i:02d}' for i in range(NUM_SPORTS)]
+
+    # 代表团规模和项目热度都呈长尾分布
+    noc_weights = rng.pareto(1.2, NUM_NOCS) + 0.05
+    sport_weights = rng.pareto(1.5, NUM_SPORTS) + 0.05
+    noc_codes = rng.choice(NUM_NOCS, rows, p=noc_weights / noc_weights.sum())
+    sport_codes = rng.choice(NUM_SPORTS, rows, p=sport_weights / sport_weights.sum())
+    event_codes = sport_codes * EVENTS_PER_SPORT + rng.integers(0, EVENTS_PER_SPORT, rows)
+    # 越近的届次参赛人数越多
+    year_weights = np.linspace(0.2, 1.0, len(YEARS)) ** 2
+
+    return pd.DataFrame({
+        'Name': pd.Categorical.from_codes(rng.integers(0, rows // 4 + 1, rows), [f'Athlete {i}' for i in range(rows // 4 + 1)]),
+        'NOC': pd.Categorical.from_codes(noc_codes, nocs),
+        'Year': np.asarray(YEARS)[rng.choice(len(YEARS), rows, p=year_weights / year_weights.sum())],
+        'City': 'City',
+        'Sport': pd.Categorical.from_codes(sport_codes, sports),
+        'Event': pd.Categorical.from_codes(event_codes, [f'{sport} Event {j}' for sport in sports for j in range(EVENTS_PER_SPORT)]),
+        'Medal': pd.Categorical.from_codes(rng.choice(len(MEDAL_VALUES), rows, p=MEDAL_PROBABILITIES), MEDAL_VALUES),
+        'Team': pd.Categorical.from_codes(noc_codes, [f'Team {noc}' for noc in nocs]),
+    })
+
+
+def make_medal_counts(athletes):
+    """由合成运动员数据汇总得到与 summerOly_medal_counts.csv 相同结构的奖牌榜"""
+    medals = pd.crosstab([athletes['Year'], athletes['NOC']], athletes['Medal'])[['Gold', 'Silver', 'Bronze']]
+    medals = medals[medals.sum(axis=1) > 0].reset_index()
+    medals['Total'] = medals[['Gold', 'Silver', 'Bronze']].sum(axis=1)
+    medals = medals.sort_values(['Year', 'Gold', 'Silver', 'Bronze'], ascending=[True, False, False, False])
+    medals['Rank'] = medals.groupby('Year').cumcount() + 1
+    return medals[['Rank', 'NOC', 'Gold', 'Silver', 'Bronze', 'Total', 'Year']].reset_index(drop=True)
+
+
+def make_award_tables(scale=1, seed=0):
+    """
+    生成 55.py 的两张输入表：award.xlsx（年份 × 列）与 event.csv（年份 × 项目 + 3 个合计列）
+    award 表的列数随规模倍数增加
+    """
+    rng = np.random.default_rng(seed)
+    columns = [f'Column {i}' for i in range(NUM_SPORTS * scale)]
+    projects = [f'Sport {i:02d}' for i in range(NUM_SPORTS)]
+    df_awards = pd.DataFrame(rng.integers(0, 30, (len(YEARS), len(columns))), columns=columns)
+    df_awards.insert(0, '年份', YEARS)
+    df_events = pd.DataFrame(rng.integers(0, 20, (len(YEARS), len(projects))), columns=projects)
+    df_events.insert(0, 'Year', YEARS)
+    df_events['Total events'] = df_events[projects].sum(axis=1)
+    df_events['Total disciplines'] = len(projects)
+    df_events['Total sports'] = len(projects)
+    return df_awards, df_events
+
+
+def time_stage(func, repeats):
+    """多次运行同一阶段，返回每次的耗时（秒）及最后一次的返回值"""
+    latencies = np.empty(repeats)
+    for k in range(repeats):
+        start = time.perf_counter()
+        value = func()
+        latencies[k] = time.perf_counter() - start
+    return latencies, value
+
+
+def run_benchmark(scales=SCALES, repeats=3, seed=0):
+    """
+    对各规模分别计时：12.py 分组、14.py/Gold.py 统计与写出、55.py 比例计算、
+    high.py 的读取 → 特征 → PCA → 灰色关联链路
+    """
+    ratio_script = load_script('55.py')
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in scales:
+            athletes = make_athletes(scale, seed)
+            csv_path = os.path.join(directory, f'athletes_{scale}x.csv')
+            athletes.to_csv(csv_path, index=False)
+            df_awards, df_events = make_award_tables(scale, seed)
+            projects = df_events.columns[1:-3]
+            countries = list(df_awards.columns[1:])
+            state = {}
+
+            def split():
+                state['grouped'], state['sheets'] = group_sheets(athletes)
+
+            def count():
+                state['counts'], state['years'], state['events'] = count_medals(state['grouped'], state['sheets'])
+                state['matrices'] = medal_matrices(state['counts'])
+
+            def write():
+                sheet_names = [name for name, _, _ in state['sheets']]
+                for kind in ['Total', 'Gold']:
+                    output_file = os.path.join(directory, f'{kind}.xlsx')
+                    write_medal_workbook(output_file, sheet_names, state['matrices'][kind],
+                                         state['years'], state['events'], TOTAL_LABELS[kind])
+
+            def high_load():
+                state['grouped_scores'] = high.load_and_preprocess_data(csv_path)
+
+            def high_features():
+                state['feature_matrix'] = high.build_feature_matrix(state['grouped_scores'])
+
+            def high_pca():
+                state['components'], state['pca'] = high.pca_transform(state['feature_matrix'])
+
+            stages = [
+                ('split_12', split, len(athletes)),
+                ('medal_counts_14_gold', count, len(athletes)),
+                ('medal_workbooks_14_gold', write, None),
+                ('award_ratio_55', lambda: ratio_script.ratio_rows(df_awards, df_events, projects, countries),
+                 len(countries) * len(YEARS) * len(projects)),
+                ('high_load', high_load, len(athletes)),
+                ('high_features', high_features, None),
+                ('high_pca', high_pca, None),
+                ('high_gra', lambda: high.calculate_component_grey_relations(
+                    state['feature_matrix'], state['components']), None),
+            ]
+            for stage, func, rows in stages:
+                latencies, _ = time_stage(func, repeats)
+                best = float(latencies.min())
+                results.append({
+                    'scale': scale,
+                    'stage': stage,
+                    'rows': rows,
+                    'best_s': best,
+                    'median_s': float(np.median(latencies)),
+                    'rows_per_s': rows / best if rows else None,
+                })
+                print(f"{scale:>4}x {stage:<24} {best:>9.3f} s  (中位数 {np.median(latencies):.3f} s)")
+    return results
+
+
+def git_commit():
+    """当前提交的哈希，便于跨提交对比；不在 git 仓库中时返回 None"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="奥运数据处理流程基准测试（合成数据）")
+    parser.add_argument('--scales', default=','.join(map(str, SCALES)), help="数据规模倍数，逗号分隔（如 1,10,100）")
+    parser.add_argument('--repeats', type=int, default=3, help="每个阶段的重复次数")
+    parser.add_argument('--seed', type=int, default=0, help="合成数据的随机种子")
+    parser.add_argument('--output', help="把结果写入该 JSON 文件")
+    parser.add_argument('--data', metavar='DIR', help="只生成 1 倍规模的合成数据文件到该目录后退出")
+    args = parser.parse_args()
+
+    if args.data:
+        os.makedirs(args.data, exist_ok=True)
+        athletes = make_athletes(1, args.seed)
+        athletes.to_csv(os.path.join(args.data, 'summerOly_athletes.csv'), index=False)
+        make_medal_counts(athletes).to_csv(os.path.join(args.data, 'summerOly_medal_counts.csv'), index=False)
+        df_awards, df_events = make_award_tables(1, args.seed)
+        df_awards.to_excel(os.path.join(args.data, 'award.xlsx'), index=False)
+        df_events.to_csv(os.path.join(args.data, 'event.csv'), index=False)
+        print(f"合成数据已保存到 {args.data}")
+    else:
+        results = run_benchmark([int(scale) for scale in args.scales.split(',')], args.repeats, args.seed)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({'commit': git_commit(), 'seed': args.seed, 'results': results},
+                          f, ensure_ascii=False, indent=2)
\ No newline at end of file
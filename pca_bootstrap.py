@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# 自助法重复次数、置信水平及每批计算的重复次数（每批内存约 chunk_size × n × p 个浮点数）
+N_BOOTSTRAP = 1000
+CONFIDENCE = 0.95
+BOOTSTRAP_CHUNK = 200
+
+
+def _standardize(X):
+    """沿倒数第二维（样本）标准化，与 StandardScaler 一致（总体标准差）；常数列只中心化"""
+    centered = X - X.mean(axis=-2, keepdims=True)
+    std = centered.std(axis=-2, keepdims=True)
+    return centered / np.where(std > 0, std, 1)
+
+
+def _decompose(X, n_components, standardize):
+    """
+    对 (..., n, p) 数据批量 SVD，返回 (主成分载荷 (..., k, p), 方差贡献率 (..., k))
+    载荷符号统一为绝对值最大的分量为正，便于比较
+    """
+    X = _standardize(X) if standardize else X - X.mean(axis=-2, keepdims=True)
+    _, s, vt = np.linalg.svd(X, full_matrices=False)
+    variance = s ** 2
+    ratio = variance / variance.sum(axis=-1, keepdims=True)
+    components = vt[..., :n_components, :]
+    pivot = np.take_along_axis(components, np.abs(components).argmax(axis=-1)[..., None], axis=-1)
+    return components * np.sign(pivot), ratio[..., :n_components]
+
+
+def pca(data, n_components, standardize=True):
+    """
+    主成分分析：返回 {'components', 'explained_variance_ratio', 'scores'}
+    components 形状 (k, p)，scores 为样本在主成分上的得分 (n, k)
+    """
+    X = np.asarray(data, dtype=float)
+    components, ratio = _decompose(X, n_components, standardize)
+    Z = _standardize(X) if standardize else X - X.mean(axis=0)
+    return {'components': components, 'explained_variance_ratio': ratio, 'scores': Z @ components.T}
+
+
+def bootstrap_pca(data, n_components, n_bootstrap=N_BOOTSTRAP, confidence=CONFIDENCE,
+                  seed=0, chunk_size=BOOTSTRAP_CHUNK, standardize=True):
+    """
+    自助法评估主成分的稳定性：每批 chunk_size 次重抽样堆叠为 (B, n, p) 一次 SVD
+    各次重抽样的载荷按与全样本载荷的内积对齐符号
+    返回 pca() 的结果，另加 loading_low/loading_high (k, p)、ratio_low/ratio_high (k,)
+    """
+    X = np.asarray(data, dtype=float)
+    result = pca(X, n_components, standardize)
+    reference = result['components']
+
+    rng = np.random.default_rng(seed)
+    loadings = []
+    ratios = []
+    for start in range(0, n_bootstrap, chunk_size):
+        size = min(chunk_size, n_bootstrap - start)
+        index = rng.integers(0, len(X), (size, len(X)))
+        components, ratio = _decompose(X[index], n_components, standardize)
+        signs = np.sign(np.einsum('bkp,kp->bk', components, reference))
+        loadings.append(components * np.where(signs == 0, 1, signs)[..., None])
+        ratios.append(ratio)
+
+    alpha = (1 - confidence) / 2
+    quantiles = [alpha, 1 - alpha]
+    result['loading_low'], result['loading_high'] = np.quantile(np.concatenate(loadings), quantiles, axis=0)
+    result['ratio_low'], result['ratio_high'] = np.quantile(np.concatenate(ratios), quantiles, axis=0)
+    return result
+
+
+def loading_table(result, columns):
+    """把 bootstrap_pca 的载荷及置信区间整理为长表：Component, Feature, Loading, Low, High"""
+    k, p = result['components'].shape
+    return pd.DataFrame({
+        'Component': np.repeat([f'PC{i + 1}' for i in range(k)], p),
+        'Feature': np.tile(list(columns), k),
+        'Loading': result['components'].ravel(),
+        'Low': result['loading_low'].ravel(),
+        'High': result['loading_high'].ravel(),
+    })
+
+
+def variance_table(result):
+    """方差贡献率及其置信区间：Component, Ratio, Low, High"""
+    k = len(result['explained_variance_ratio'])
+    return pd.DataFrame({
+        'Component': [f'PC{i + 1}' for i in range(k)],
+        'Ratio': result['explained_variance_ratio'],
+        'Low': result['ratio_low'],
+        'High': result['ratio_high'],
+    })
\ No newline at end of file
@@ -0,0 +1,164 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# 各国奖牌榜数据
+MEDAL_COUNTS_FILE = 'summerOly_medal_counts.csv'
+# 默认截断年份（教练到任/离任的届次），未单独指定的国家使用 DEFAULT_CUTOFF
+DEFAULT_CUTOFF = 1984
+COACH_CUTOFFS = {'Romania': 1984, 'United States': 1984}
+# 被解释变量：总奖牌数、金牌占比、银牌占比
+OUTCOMES = ['Total', 'Gold', 'Silver']
+# 自助法重复次数、置信水平及每批计算的重复次数
+N_BOOTSTRAP = 1000
+CONFIDENCE = 0.95
+BOOTSTRAP_CHUNK = 200
+
+
+def load_panel(file_path=MEDAL_COUNTS_FILE):
+    """
+    读取奖牌榜并整理为面板：返回 (countries, years, Y)
+    Y 形状为 (被解释变量, 国家, 年份)，未上榜的年份为 NaN
+    """
+    data = pd.read_csv(file_path)
+    data['NOC'] = data['NOC'].str.strip()  # 部分国家名带有多余空格
+    data = data.groupby(['NOC', 'Year'], as_index=False)[['Gold', 'Silver', 'Total']].sum()
+
+    values = {
+        'Total': data['Total'].astype(float),
+        'Gold': data['Gold'] / data['Total'],
+        'Silver': data['Silver'] / data['Total'],
+    }
+    country_codes, countries = pd.factorize(data['NOC'], sort=True)
+    year_codes, years = pd.factorize(data['Year'], sort=True)
+
+    Y = np.full((len(OUTCOMES), len(countries), len(years)), np.nan)
+    for i, outcome in enumerate(OUTCOMES):
+        Y[i, country_codes, year_codes] = values[outcome].to_numpy()
+    return np.asarray(countries, dtype=object), np.asarray(years), Y
+
+
+def design_matrix(years, cutoffs):
+    """
+    断点回归设计矩阵，形状 (国家, 年份, 4)：
+    截距、距截断年份的届数、截断后虚拟变量及其与届数的交互项（虚拟变量系数即教练效应）
+    """
+    t = (years[None, :] - cutoffs[:, None]) / 4.0
+    after = (t >= 0).astype(float)
+    return np.stack([np.ones_like(t), t, after, after * t], axis=-1)
+
+
+def _solve(XtX, XtY):
+    """批量求解正规方程；设计矩阵不满秩（截断前或后数据不足）的结果记为 NaN"""
+    beta = np.einsum('...kl,...ol->...ok', np.linalg.pinv(XtX), XtY)
+    singular = np.linalg.matrix_rank(XtX) < XtX.shape[-1]
+    beta[singular] = np.nan
+    return beta
+
+
+def fit(X, Y, weights):
+    """
+    所有国家、所有被解释变量一次加权最小二乘
+    X: (国家, 年份, 4)；Y: (被解释变量, 国家, 年份)；weights: (..., 国家, 年份)
+    返回系数 (..., 国家, 被解释变量, 4)
+    """
+    Y = np.nan_to_num(Y)
+    XtX = np.einsum('...cj,cjk,cjl->...ckl', weights, X, X)
+    XtY = np.einsum('...cj,cjk,ocj->...cok', weights, X, Y)
+    return _solve(XtX, XtY)
+
+
+def bootstrap_weights(mask, after, n_bootstrap, rng):
+    """
+    分层自助抽样：每个国家截断前、后的观测分别有放回抽样（保证两侧都有数据）
+    以抽中次数作为权重返回，形状 (n_bootstrap, 国家, 年份)；全部用索引数组向量化生成
+    """
+    n_countries, n_years = mask.shape
+    obs = np.flatnonzero(mask.ravel())
+    strata = (obs // n_years) * 2 + after.ravel()[obs]
+    order = np.argsort(strata, kind='stable')
+    obs, strata = obs[order], strata[order]
+    sizes = np.bincount(strata, minlength=n_countries * 2)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    # 每个观测位置从其所在层中均匀抽取一个观测
+    draws = offsets[strata] + (rng.random((n_bootstrap, len(obs))) * sizes[strata]).astype(np.int64)
+    flat = np.arange(n_bootstrap)[:, None] * mask.size + obs[draws]
+    weights = np.bincount(flat.ravel(), minlength=n_bootstrap * mask.size)
+    return weights.reshape(n_bootstrap, n_countries, n_years).astype(float)
+
+
+def estimate_effects(file_path=MEDAL_COUNTS_FILE, cutoffs=None, n_bootstrap=N_BOOTSTRAP,
+                     confidence=CONFIDENCE, seed=0, chunk_size=BOOTSTRAP_CHUNK):
+    """
+    估计所有国家的教练效应，cutoffs 为 {国家: 截断年份}（缺省见 COACH_CUTOFFS / DEFAULT_CUTOFF）
+    返回长表：NOC, Outcome, before（截断处左极限的拟合值）, effect, ci_low, ci_high, R2, MSE, n_before, n_after
+    """
+    countries, years, Y = load_panel(file_path)
+    cutoffs = {**COACH_CUTOFFS, **(cutoffs or {})}
+    cutoff_years = np.array([cutoffs.get(country, DEFAULT_CUTOFF) for country in countries], dtype=float)
+
+    X = design_matrix(years, cutoff_years)
+    mask = ~np.isnan(Y[0])
+    after = X[..., 2].astype(np.int64)
+    beta = fit(X, Y, mask.astype(float))
+
+    # 拟合优度：R² 与均方误差
+    fitted = np.einsum('cjk,cok->ocj', X, beta)
+    n_obs = mask.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        residuals = np.where(mask, Y - fitted, 0)
+        sse = (residuals ** 2).sum(axis=2)
+        mean = np.nansum(Y, axis=2, keepdims=True) / n_obs[:, None]
+        sst = (np.where(mask, Y - mean, 0) ** 2).sum(axis=2)
+        r2 = 1 - sse / sst
+        mse = sse / n_obs
+
+    # 自助法置信区间：分批计算，避免权重数组过大
+    rng = np.random.default_rng(seed)
+    effects = []
+    for start in range(0, n_bootstrap, chunk_size):
+        weights = bootstrap_weights(mask, after, min(chunk_size, n_bootstrap - start), rng)
+        effects.append(fit(X, Y, weights)[..., 2])
+    effects = np.concatenate(effects)  # (重复次数, 国家, 被解释变量)
+    alpha = (1 - confidence) / 2
+    with warnings.catch_warnings():
+        # 无法识别效应的国家（截断前或后无数据）全为 NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        ci_low, ci_high = np.nanpercentile(effects, [100 * alpha, 100 * (1 - alpha)], axis=0)
+
+    return pd.DataFrame({
+        'NOC': np.repeat(countries, len(OUTCOMES)),
+        'Outcome': np.tile(OUTCOMES, len(countries)),
+        'before': beta[..., 0].ravel(),
+        'effect': beta[..., 2].ravel(),
+        'ci_low': ci_low.ravel(),
+        'ci_high': ci_high.ravel(),
+        'R2': r2.T.ravel(),
+        'MSE': mse.T.ravel(),
+        'n_before': np.repeat((mask & (after == 0)).sum(axis=1), len(OUTCOMES)),
+        'n_after': np.repeat((mask & (after == 1)).sum(axis=1), len(OUTCOMES)),
+    })
+
+
+def plot_effects(results, country):
+    """把单个国家的估计结果整理为 chart_render.render_coach_effect 的输入格式"""
+    rows = results[results['NOC'] == country].set_index('Outcome')
+    return {
+        outcome: {
+            'before': float(row['before']),
+            'effect': float(row['effect']),
+            'R2': float(row['R2']),
+            'MSE': float(row['MSE']),
+            'ci': [float(row['ci_low']), float(row['ci_high'])],
+        }
+        for outcome, row in rows.iterrows()
+    }
+
+
+if __name__ == "__main__":
+    results = estimate_effects()
+    results.to_csv('coach_effects.csv', index=False)
+    print(results[results['NOC'].isin(COACH_CUTOFFS)])
+    print("所有国家的估计结果已保存到 coach_effects.csv")
\ No newline at end of file
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 测试直接导入仓库根目录下的脚本模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 合成数据的取值：'GB/R' 的工作表名与 'GBR' 相同，用于覆盖 12.py 的 _1 后缀
+NOCS = ['USA', 'CHN', 'GB/R', 'GBR', 'FRA', 'NED']
+YEARS = [1996, 2000, 2004, 2008, 2012]
+SPORTS = ['Athletics', 'Swimming', 'Rowing', 'Judo', '', None]
+MEDALS = ['Gold', 'Silver', 'Bronze', 'No medal', None]
+
+
+@pytest.fixture
+def athletes():
+    """与 athletes.xlsx 列结构相同的小型合成数据（第二列为 NOC），含空项目、无效奖牌及只出现一次的 NOC"""
+    rng = np.random.default_rng(0)
+    n = 400
+    df = pd.DataFrame({
+        'Name': [f'Athlete {i}' for i in range(n)],
+        'NOC': rng.choice(NOCS, n, p=[0.3, 0.25, 0.1, 0.1, 0.15, 0.1]),
+        'Year': rng.choice(YEARS, n),
+        'City': 'City',
+        'Sport': rng.choice(np.array(SPORTS, dtype=object), n, p=[0.3, 0.25, 0.2, 0.15, 0.05, 0.05]),
+        'Event': 'Event',
+        'Medal': rng.choice(np.array(MEDALS, dtype=object), n, p=[0.15, 0.15, 0.15, 0.45, 0.1]),
+        'Team': 'Team',
+    })
+    df.loc[n - 1, 'NOC'] = 'KEN'
+    return df
\ No newline at end of file
@@ -0,0 +1,14 @@
+import importlib.util
+import os
+
+# 仓库根目录（tests 的上一级）
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script(file_name):
+    """按文件路径导入仓库根目录下以数字命名的脚本（脚本主体在 __main__ 中，导入时只定义函数）"""
+    name = 'script_' + os.path.splitext(file_name)[0]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
\ No newline at end of file
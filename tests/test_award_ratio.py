@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import load_script
+
+# 合成数据：奖牌表 2004 年重复一行，项目表缺少 2008 年、2000 年重复一行，部分子项目数为 0
+AWARD_YEARS = [2000, 2004, 2004, 2008, 2012]
+EVENT_YEARS = [2000, 2000, 2004, 2012]
+COUNTRIES = ['China', 'United States', 'Great/Britain']
+PROJECTS = ['Swimming', 'Diving', 'Rowing']
+
+
+@pytest.fixture
+def tables():
+    rng = np.random.default_rng(0)
+    df_awards = pd.DataFrame(rng.integers(0, 30, (len(AWARD_YEARS), len(COUNTRIES))), columns=COUNTRIES)
+    df_awards.insert(0, '年份', AWARD_YEARS)
+    df_events = pd.DataFrame(rng.integers(0, 4, (len(EVENT_YEARS), len(PROJECTS))), columns=PROJECTS)
+    df_events.insert(0, 'Year', EVENT_YEARS)
+    df_events['Total events'] = df_events[PROJECTS].sum(axis=1)
+    df_events['Total disciplines'] = len(PROJECTS)
+    df_events['Total sports'] = len(PROJECTS)
+    return df_awards, df_events
+
+
+def reference_ratios(df_awards, df_events, country):
+    """按原 55.py 的逐年、逐项目循环计算单个国家的比例表"""
+    rows = []
+    for year in df_awards['年份']:
+        awards_data = df_awards.loc[df_awards['年份'] == year, country].values[0]
+        for project in df_events.columns[1:-3]:
+            match = df_events.loc[df_events['Year'] == year, project]
+            sub_events = match.values[0] if not match.empty else 0
+            rows.append({
+                'Year': year,
+                'Project': project,
+                'Total Golds': awards_data,
+                'Sub Events': sub_events,
+                'Proportion': awards_data / sub_events if sub_events > 0 else 0,
+            })
+    return pd.DataFrame(rows)
+
+
+def test_ratio_rows_match_reference(tables):
+    df_awards, df_events = tables
+    ratio_script = load_script('55.py')
+    result = ratio_script.ratio_rows(df_awards, df_events, df_events.columns[1:-3], COUNTRIES)
+
+    for country in COUNTRIES:
+        expected = reference_ratios(df_awards, df_events, country)
+        actual = result[result['Country'] == country].drop(columns='Country').reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_update_ratio_rows_matches_full_rebuild(tables):
+    df_awards, df_events = tables
+    ratio_script = load_script('55.py')
+    projects = df_events.columns[1:-3]
+    expected = ratio_script.ratio_rows(df_awards, df_events, projects, COUNTRIES)
+
+    # 上次结果不含 2012 年；2012 年的奖牌数随后才公布
+    previous = ratio_script.ratio_rows(df_awards[df_awards['年份'] != 2012], df_events, projects, COUNTRIES)
+    updated = ratio_script.update_ratio_rows(previous, df_awards, df_events, projects, COUNTRIES, 2012)
+    pd.testing.assert_frame_equal(updated, expected.reset_index(drop=True))
+
+    # 更新已有年份：用新的奖牌数替换该年份的旧结果
+    revised = df_awards.copy()
+    revised.loc[revised['年份'] == 2000, COUNTRIES] += 1
+    updated = ratio_script.update_ratio_rows(expected, revised, df_events, projects, COUNTRIES, 2000)
+    pd.testing.assert_frame_equal(
+        updated, ratio_script.ratio_rows(revised, df_events, projects, COUNTRIES).reset_index(drop=True)
+    )
\ No newline at end of file
@@ -0,0 +1,35 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from excel_export import ExcelExport
+
+# 第一批全为空值，第二批为整数，第三批才出现小数
+ROWS = [['p', 'q'], [None, None], [1, 'z'], [2.5, None]]
+
+
+def test_parquet_rows_require_schema(tmp_path):
+    with ExcelExport(str(tmp_path / 'out.xlsx'), sidecar='parquet', batch_size=1) as export:
+        with pytest.raises(ValueError):
+            export.write_rows('R', ROWS)
+
+
+def test_parquet_rows_keep_schema_across_batches(tmp_path):
+    schema = pa.schema([('p', pa.float64()), ('q', pa.string())])
+    with ExcelExport(str(tmp_path / 'out.xlsx'), sidecar='parquet', batch_size=1) as export:
+        export.write_rows('R', ROWS, schema)
+
+    table = pq.read_table(tmp_path / 'out_sheets' / 'R.parquet')
+    assert table.schema.equals(schema)
+    assert table.to_pylist() == [{'p': None, 'q': None}, {'p': 1.0, 'q': 'z'}, {'p': 2.5, 'q': None}]
+
+
+def test_parquet_frame_types_come_from_whole_frame(tmp_path):
+    df = pd.DataFrame({'p': [None, 1.0, 2.5], 'q': [None, 'z', None]})
+    with ExcelExport(str(tmp_path / 'out.xlsx'), sidecar='parquet', batch_size=1) as export:
+        export.write_frame('F', df)
+        export.write_frame('Empty', df.iloc[:0])
+
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / 'out_sheets' / 'F.parquet'), df)
+    assert list(pd.read_parquet(tmp_path / 'out_sheets' / 'Empty.parquet').columns) == ['p', 'q']
\ No newline at end of file
@@ -0,0 +1,76 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import high
+
+
+def reference_features(grouped):
+    """原 high.py 的逐组特征计算（std、np.polyfit、逐组求和）"""
+    features = {
+        '奖牌稳定性': lambda df: df.groupby(['NOC', 'Sport'])['Score'].std(),
+        '时间趋势': lambda df: df.groupby(['NOC', 'Sport'])['Year'].apply(
+            lambda x: np.polyfit(x, df.loc[x.index, 'Score'], 1)[0]
+        ),
+        '竞争力指数': lambda df: df.groupby(['NOC', 'Sport'])['Score'].sum() /
+                             df.groupby('NOC')['Score'].sum().max(),
+        '持续参赛性': lambda df: df.groupby(['NOC', 'Sport'])['Year'].nunique(),
+    }
+    feature_matrix = pd.DataFrame()
+    with warnings.catch_warnings():
+        # 只参赛一届的组，np.polyfit 会提示秩不足
+        warnings.simplefilter('ignore')
+        for name, func in features.items():
+            feature_matrix[name] = func(grouped)
+    return feature_matrix.fillna(0)
+
+
+def test_feature_matrix_matches_reference(athletes, tmp_path):
+    csv_path = tmp_path / 'summerOly_athletes.csv'
+    athletes.to_csv(csv_path, index=False)
+    grouped = high.load_and_preprocess_data(csv_path)
+    # 参考实现按普通列分组，分类列转回字符串
+    plain = grouped.astype({'NOC': str, 'Sport': str, 'Year': int})
+
+    expected = reference_features(plain)
+    actual = high.build_feature_matrix(grouped)
+    actual.index = actual.index.set_levels([level.astype(str) for level in actual.index.levels])
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_index_type=False,
+                                  rtol=1e-12, atol=1e-12)
+
+def reference_grey_relations(feature_matrix):
+    """原 high.py 的逐项目灰色关联度：按 pandas 索引对齐，未参加的国家为缺失值"""
+    national_total = feature_matrix.groupby('NOC').sum().sum(axis=1)
+    grey_relations = []
+    for sport in feature_matrix.index.get_level_values('Sport').unique():
+        sport_scores = feature_matrix.xs(sport, level='Sport').sum(axis=1)
+        delta = np.abs(national_total - sport_scores)
+        coeff = (delta.min() + 0.5 * delta.max()) / (delta + 0.5 * delta.max())
+        grey_relations.append(coeff.mean())
+    return grey_relations
+
+
+def test_grey_relations_match_reference(athletes, tmp_path):
+    csv_path = tmp_path / 'summerOly_athletes.csv'
+    athletes.to_csv(csv_path, index=False)
+    feature_matrix = high.build_feature_matrix(high.load_and_preprocess_data(csv_path))
+
+    expected = reference_grey_relations(feature_matrix)
+    np.testing.assert_allclose(high.calculate_grey_relations(feature_matrix), expected, rtol=1e-12)
+    # 分块计算与整体计算结果一致
+    np.testing.assert_allclose(high.calculate_grey_relations(feature_matrix, chunk_size=7), expected, rtol=1e-12)
+
+def test_component_grey_relations_are_scale_free(athletes, tmp_path):
+    csv_path = tmp_path / 'summerOly_athletes.csv'
+    athletes.to_csv(csv_path, index=False)
+    feature_matrix = high.build_feature_matrix(high.load_and_preprocess_data(csv_path))
+    principal_components, _ = high.pca_transform(feature_matrix)
+
+    # 参考序列与主成分得分先各自标准化，关联度与两者的量纲无关
+    grey_relations = high.calculate_component_grey_relations(feature_matrix, principal_components)
+    np.testing.assert_allclose(
+        high.calculate_component_grey_relations(feature_matrix * 100, principal_components * 0.01 + 5),
+        grey_relations, rtol=1e-12,
+    )
+    assert all(0 < grade <= 1 for grade in grey_relations)
\ No newline at end of file
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from medal_cube import DIMS, MEDAL_LABELS, build_cube
+
+
+def test_cube_skips_rows_with_missing_dimensions(athletes, tmp_path, monkeypatch):
+    # 列式缓存目录为相对路径，在临时目录中构建
+    monkeypatch.chdir(tmp_path)
+    athletes.loc[0, 'NOC'] = np.nan
+    athletes.loc[1, 'Sport'] = np.nan
+    athletes.to_csv('athletes.csv', index=False)
+
+    cube = build_cube('athletes.csv', 'cube')
+
+    # 参考结果：按 CSV 读回的数据分组计数，缺失的 NOC、项目不计入，未获奖记为 'No medal'
+    data = pd.read_csv('athletes.csv')
+    data['Medal'] = data['Medal'].where(data['Medal'].isin(MEDAL_LABELS[:-1]), MEDAL_LABELS[-1])
+    expected = data.groupby(DIMS).size()
+    actual = cube.sum(by=DIMS)
+    assert actual.sum() == len(data.dropna(subset=['NOC', 'Sport']))
+    pd.testing.assert_series_equal(actual.sort_index(), expected, check_names=False, check_index_type=False)
\ No newline at end of file
@@ -0,0 +1,119 @@
+from collections import defaultdict
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from athlete_cache import group_sheets, write_store
+from medal_engine import (
+    TOTAL_LABELS, build_medal_workbooks, count_medals, medal_matrices, sheet_rows, update_medal_workbooks,
+)
+
+# 各统计口径计入的奖牌类型
+KIND_MEDALS = {'Total': ['Gold', 'Silver', 'Bronze'], 'Gold': ['Gold']}
+
+
+def reference_sheets(df):
+    """按原 12.py 的逐值循环划分工作表：整表为 Sheet1，重复出现的值各成一表，名称重复时加后缀"""
+    sheets = {'Sheet1': df}
+    column_b = df.iloc[:, 1]
+    for value in column_b[column_b.duplicated(keep=False)].unique():
+        new_sheet_name = ''.join(char for char in str(value)[:31] if char.isalnum() or char in ('_', ' '))
+        counter = 1
+        original_name = new_sheet_name
+        while new_sheet_name in sheets:
+            new_sheet_name = f"{original_name}_{counter}"
+            counter += 1
+        sheets[new_sheet_name] = df[column_b == value]
+    return sheets
+
+
+def reference_rows(df, kind):
+    """按原 14.py / Gold.py 的逐行计数生成一个工作表的所有行"""
+    medal_count_by_year = defaultdict(lambda: defaultdict(int))
+    for year, event, medal in zip(df['Year'], df['Sport'], df['Medal']):
+        if not pd.isna(event) and event and medal in KIND_MEDALS[kind]:
+            medal_count_by_year[year][event] += 1
+
+    years = sorted(medal_count_by_year)
+    events = sorted({event for counts in medal_count_by_year.values() for event in counts})
+    rows = [['年份', *events, TOTAL_LABELS[kind]]]
+    for year in years:
+        values = [medal_count_by_year[year].get(event, 0) for event in events]
+        rows.append([int(year), *values, sum(values)])
+    return rows
+
+
+def read_workbook(path):
+    """读取工作簿为 {工作表名: 行列表}"""
+    wb = load_workbook(path, read_only=True)
+    sheets = {name: [list(row) for row in wb[name].iter_rows(values_only=True)] for name in wb.sheetnames}
+    wb.close()
+    return sheets
+
+
+def test_medal_rows_match_reference(athletes):
+    grouped, sheets = group_sheets(athletes)
+    reference = reference_sheets(athletes)
+    assert [name for name, _, _ in sheets] == list(reference)
+
+    counts, years, events = count_medals(grouped, sheets)
+    matrices = medal_matrices(counts)
+    for kind in KIND_MEDALS:
+        for (name, _, _), matrix in zip(sheets, matrices[kind]):
+            rows = list(sheet_rows(matrix, years, events, TOTAL_LABELS[kind]))
+            assert rows == reference_rows(reference[name], kind), (kind, name)
+
+
+def test_workbooks_match_reference(athletes, tmp_path):
+    store = str(tmp_path / 'athletes_grouped.arrow')
+    write_store(*group_sheets(athletes), store)
+    outputs = {kind: str(tmp_path / f'{kind}.xlsx') for kind in KIND_MEDALS}
+    build_medal_workbooks(store, outputs, state_file=None)
+
+    reference = reference_sheets(athletes)
+    for kind, output_file in outputs.items():
+        written = read_workbook(output_file)
+        assert list(written) == list(reference)
+        for name, df in reference.items():
+            assert written[name] == reference_rows(df, kind), (kind, name)
+
+
+@pytest.fixture
+def split_athletes(athletes):
+    """
+    拆分为历史记录与新一届记录：KEN 在历史中只出现一次，新一届再出现后才单独成表；
+    BRA 只出现在新一届中
+    """
+    athletes.loc[athletes['NOC'] == 'KEN', 'Year'] = 2000
+    history = athletes[athletes['Year'] < 2012]
+    new_rows = athletes[athletes['Year'] == 2012].copy()
+    new_rows.iloc[:3, 1] = ['KEN', 'BRA', 'BRA']
+    return history, new_rows
+
+
+def build_from(df, tmp_path, name, state_file=None):
+    """由数据按 12.py 的方式分组写出列式文件，再生成 Total/Gold 工作簿"""
+    store = str(tmp_path / f'{name}.arrow')
+    write_store(*group_sheets(df), store)
+    outputs = {kind: str(tmp_path / f'{name}_{kind}.xlsx') for kind in KIND_MEDALS}
+    build_medal_workbooks(store, outputs, state_file=state_file)
+    return outputs
+
+
+def test_update_matches_full_rebuild(split_athletes, tmp_path):
+    history, new_rows = split_athletes
+    expected = build_from(pd.concat([history, new_rows], ignore_index=True), tmp_path, 'full')
+
+    state_file = str(tmp_path / 'medal_counts.npz')
+    outputs = build_from(history, tmp_path, 'history', state_file)
+    update_medal_workbooks(new_rows, outputs, state_file=state_file)
+    for kind, output_file in outputs.items():
+        written = read_workbook(output_file)
+        assert 'KEN' in written and 'BRA' in written
+        assert written == read_workbook(expected[kind]), kind
+
+    # 重复导入同一届记录时整体替换该年份，不会重复计数
+    update_medal_workbooks(new_rows, outputs, state_file=state_file)
+    for kind, output_file in outputs.items():
+        assert read_workbook(output_file) == read_workbook(expected[kind]), kind
\ No newline at end of file
@@ -1,6 +1,12 @@
+import argparse
+import json
+import os
 import cv2 as cv
 import numpy as np
+import threading
 import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # 常量定义
 THRESHOLD_AREA_MIN = 100  # 最小有效区域阈值
@@ -9,11 +15,24 @@ THRESHOLD_STATE = 0.25  # 状态判断阈值比例
 THRESHOLD_IMG_STATE = 70  # 像素状态阈值
 KERNEL_SIZE = (3, 3)  # 形态学操作核大小
 NUM_SAMPLES = 10  # 视频采样帧数
+BUFFER_SIZE = 4  # 帧缓冲区大小（只保留最新的若干帧）
+NUM_WORKERS = 2  # 检测线程数（OpenCV 运算期间释放 GIL）
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')  # 离线模式支持的图片格式
+DEBOUNCE_FRAMES = 3  # 状态连续相同多少帧才确认变化
+ROI_PADDING = 0.25  # 跟踪模式下 ROI 相对上一个矩形的边距比例
+ROI_CONFIDENCE = 0.8  # ROI 检测结果的最低置信度（与上一帧面积之比）
+PYRAMID_LEVELS = 1  # 整帧初始搜索时的金字塔缩小次数（每次缩小一半）
 
 
-def preprocess_image(img):
-    """图像预处理流程：灰度化->中值滤波->二值化->边缘检测->闭运算"""
-    gray = cv.cvtColor(img, cv.COLOR_BGR2GRAY)
+def to_gray(img):
+    """灰度化（每帧只需计算一次，供检测和格子分类共用）"""
+    return cv.cvtColor(img, cv.COLOR_BGR2GRAY)
+
+
+def preprocess_image(img, gray=None):
+    """图像预处理流程：灰度化->中值滤波->二值化->边缘检测->闭运算（已有灰度图时 img 可为 None）"""
+    if gray is None:
+        gray = to_gray(img)
     blurred = cv.medianBlur(gray, 5)
     _, binary = cv.threshold(blurred, THRESHOLD_BINARY, 255, cv.THRESH_BINARY)
     edges = cv.Canny(binary, 100, 200)
@@ -22,9 +41,8 @@ def preprocess_image(img):
     return closed
 
 
-def find_chessboard(img):
-    """在图像中寻找最大轮廓对应的棋盘区域"""
-    processed = preprocess_image(img)
+def largest_rect(processed, min_area=THRESHOLD_AREA_MIN):
+    """在预处理后的二值图中寻找外接矩形面积最大的轮廓，返回 (面积, 矩形)"""
     contours, _ = cv.findContours(processed, cv.RETR_EXTERNAL, cv.CHAIN_APPROX_SIMPLE)
 
     max_area = 0
@@ -32,59 +50,238 @@ def find_chessboard(img):
     for contour in contours:
         x, y, w, h = cv.boundingRect(contour)
         area = w * h
-        if area > max_area and area >= THRESHOLD_AREA_MIN:
+        if area > max_area and area >= min_area:
             max_area = area
             best_rect = (x, y, x + w, y + h)
+    return max_area, best_rect
 
+
+def find_chessboard(img, gray=None, draw=True, roi=None):
+    """
+    在图像中寻找最大轮廓对应的棋盘区域
+    roi 为 (x1, y1, x2, y2) 时只在该区域内搜索，返回的矩形仍为整帧坐标
+    """
+    if gray is None:
+        gray = to_gray(img)
+    x0, y0 = 0, 0
+    if roi is not None:
+        x0, y0, x1, y1 = roi
+        gray = gray[y0:y1, x0:x1]
+    max_area, best_rect = largest_rect(preprocess_image(None, gray))
     if best_rect:
+        best_rect = (best_rect[0] + x0, best_rect[1] + y0, best_rect[2] + x0, best_rect[3] + y0)
+
+    if best_rect and draw:
         cv.rectangle(img, best_rect[:2], best_rect[2:], (0, 255, 0), 2)
     return img, max_area, best_rect
 
 
-def analyze_region(image, x1, y1, x2, y2):
-    """分析指定区域的状态"""
-    x1, y1, x2, y2 = map(int, [x1, y1, x2, y2])
+def find_chessboard_pyramid(gray, levels=PYRAMID_LEVELS):
+    """整帧粗搜索：在缩小 2^levels 倍的图像上检测，返回放大回原尺寸的矩形"""
+    small = gray
+    for _ in range(levels):
+        small = cv.pyrDown(small)
+    scale = 2 ** levels
+    _, rect = largest_rect(preprocess_image(None, small), THRESHOLD_AREA_MIN / scale ** 2)
+    if rect is None:
+        return None
+    return tuple(v * scale for v in rect)
+
+
+class BoardTracker:
+    """
+    跟踪模式的棋盘检测：检测到可信的棋盘后，后续帧只在上一个矩形外扩 padding 的 ROI 内搜索；
+    ROI 内置信度下降（面积变化过大或矩形贴住 ROI 边界）时回退到整帧搜索。
+    整帧搜索可先在金字塔缩小图上粗定位，再在粗定位结果周围的 ROI 内精确定位
+    """
+
+    def __init__(self, padding=ROI_PADDING, min_confidence=ROI_CONFIDENCE, pyramid_levels=PYRAMID_LEVELS):
+        self.padding = padding
+        self.min_confidence = min_confidence
+        self.pyramid_levels = pyramid_levels
+        self.full_searches = 0
+        self.roi_searches = 0
+        self._last = None
+        self._lock = threading.Lock()
 
-    # 区域有效性检查
-    if (x1 >= x2) or (y1 >= y2) or \
-            (x1 < 0) or (y1 < 0) or \
-            (x2 > image.shape[1]) or (y2 > image.shape[0]):
-        return 0, image
+    def _roi(self, rect, shape):
+        x1, y1, x2, y2 = rect
+        pad_x = int((x2 - x1) * self.padding) + 1
+        pad_y = int((y2 - y1) * self.padding) + 1
+        return (max(x1 - pad_x, 0), max(y1 - pad_y, 0),
+                min(x2 + pad_x, shape[1]), min(y2 + pad_y, shape[0]))
 
-    # 区域处理
-    gray = cv.cvtColor(image, cv.COLOR_BGR2GRAY)
-    roi = gray[y1:y2, x1:x2]
-    mask = roi < THRESHOLD_IMG_STATE
-    ratio = np.sum(mask) / (roi.size + 1e-6)  # 防止除以零
+    def _confidence(self, rect, roi, reference, shape):
+        """以与参考矩形的面积比作为置信度；贴住 ROI 边界（且不是图像边界）时视为不可信"""
+        if rect is None:
+            return 0.0
+        for value, limit, bound in ((rect[0], roi[0], 0), (rect[1], roi[1], 0),
+                                    (rect[2], roi[2], shape[1]), (rect[3], roi[3], shape[0])):
+            if value == limit and limit != bound:
+                return 0.0
+        area = (rect[2] - rect[0]) * (rect[3] - rect[1])
+        ref_area = (reference[2] - reference[0]) * (reference[3] - reference[1])
+        return min(area, ref_area) / max(area, ref_area)
 
-    # 可视化标记
-    color = (0, 0, 255) if ratio > THRESHOLD_STATE else (255, 0, 0)
-    cv.rectangle(image, (x1, y1), (x2, y2), color, 1)
-    return int(ratio > THRESHOLD_STATE), image
+    def _search_roi(self, gray, reference):
+        roi = self._roi(reference, gray.shape)
+        _, _, rect = find_chessboard(None, gray=gray, draw=False, roi=roi)
+        return rect, self._confidence(rect, roi, reference, gray.shape)
 
+    def detect(self, img, gray=None):
+        """检测棋盘矩形；未检测到时返回 None"""
+        if gray is None:
+            gray = to_gray(img)
+        with self._lock:
+            last = self._last
 
-def get_chess_state(frame, rect):
-    """获取棋盘3x3状态矩阵"""
+        rect = None
+        if last is not None:
+            self.roi_searches += 1
+            rect, confidence = self._search_roi(gray, last)
+            if confidence < self.min_confidence:
+                rect = None
+
+        if rect is None:
+            self.full_searches += 1
+            if self.pyramid_levels:
+                coarse = find_chessboard_pyramid(gray, self.pyramid_levels)
+                if coarse is not None:
+                    rect, confidence = self._search_roi(gray, coarse)
+                    if confidence < self.min_confidence:
+                        rect = None
+            if rect is None:
+                _, _, rect = find_chessboard(None, gray=gray, draw=False)
+
+        with self._lock:
+            self._last = rect
+        return rect
+
+
+def cell_bounds(rect, shape):
+    """计算 3x3 各格的边界（与逐格划分时的取整方式一致）及有效性"""
     x_start, y_start, x_end, y_end = rect
     cell_w = (x_end - x_start) / 3
     cell_h = (y_end - y_start) / 3
 
+    steps = np.arange(3)
+    x1 = x_start + steps * cell_w
+    y1 = y_start + steps * cell_h
+    x1, x2 = x1.astype(int), (x1 + cell_w).astype(int)
+    y1, y2 = y1.astype(int), (y1 + cell_h).astype(int)
+
+    # 区域有效性检查（行对应 y，列对应 x）
+    valid_x = (x1 < x2) & (x1 >= 0) & (x2 <= shape[1])
+    valid_y = (y1 < y2) & (y1 >= 0) & (y2 <= shape[0])
+    return x1, y1, x2, y2, valid_y[:, None] & valid_x[None, :]
+
+
+def classify_cells(gray, rect):
+    """
+    一次计算 3x3 各格的状态：对棋盘区域的暗像素求积分图，9 个格子各查表一次
+    """
+    x1, y1, x2, y2, valid = cell_bounds(rect, gray.shape)
     state = np.zeros((3, 3), dtype=int)
+    if not valid.any():
+        return state
+
+    # 只对棋盘区域（裁剪到图像范围内）求积分图
+    left, top = max(int(x1.min()), 0), max(int(y1.min()), 0)
+    right, bottom = min(int(x2.max()), gray.shape[1]), min(int(y2.max()), gray.shape[0])
+    dark = (gray[top:bottom, left:right] < THRESHOLD_IMG_STATE).astype(np.uint8)
+    integral = cv.integral(dark)
+
+    # 无效格子的坐标先裁剪，结果随后被有效性掩码置零
+    cx1 = np.clip(x1 - left, 0, right - left)[None, :]
+    cx2 = np.clip(x2 - left, 0, right - left)[None, :]
+    cy1 = np.clip(y1 - top, 0, bottom - top)[:, None]
+    cy2 = np.clip(y2 - top, 0, bottom - top)[:, None]
+    counts = integral[cy2, cx2] - integral[cy1, cx2] - integral[cy2, cx1] + integral[cy1, cx1]
+    areas = (cy2 - cy1) * (cx2 - cx1)
+    ratio = counts / (areas + 1e-6)  # 防止除以零
+
+    state[valid & (ratio > THRESHOLD_STATE)] = 1
+    return state
+
+
+def draw_chess_state(frame, rect, state):
+    """可视化标记：在帧上绘制各格边框（有子为红色，无子为蓝色）"""
+    x1, y1, x2, y2, valid = cell_bounds(rect, frame.shape)
     for i in range(3):
         for j in range(3):
-            x1 = x_start + j * cell_w
-            y1 = y_start + i * cell_h
-            x2 = x1 + cell_w
-            y2 = y1 + cell_h
-            state[i, j], frame = analyze_region(frame, x1, y1, x2, y2)
-
-    cv.imshow("Chess Analysis", frame)
-    cv.waitKey(1)
+            if valid[i, j]:
+                color = (0, 0, 255) if state[i, j] else (255, 0, 0)
+                cv.rectangle(frame, (int(x1[j]), int(y1[i])), (int(x2[j]), int(y2[i])), color, 1)
+    return frame
+
+
+def get_chess_state(frame, rect, show=True, gray=None):
+    """获取棋盘3x3状态矩阵（gray 为已计算好的灰度图时直接复用）"""
+    if gray is None:
+        gray = to_gray(frame)
+    state = classify_cells(gray, rect)
+
+    if show:
+        cv.imshow("Chess Analysis", draw_chess_state(frame, rect, state))
+        cv.waitKey(1)
     return state
 
 
-def stable_rectangle_detection(video):
-    """稳定矩形区域检测：多帧采样+异常值过滤"""
+class RectangleStabilizer:
+    """
+    流式矩形稳定器：每帧更新一次，预热后每帧都输出稳定的矩形
+    method='median' 为滑动窗口中位数（窗口大小固定，抗异常值）；
+    method='ema' 为指数滑动平均（alpha 越大响应越快）
+    """
+
+    def __init__(self, window=NUM_SAMPLES, method='median', alpha=0.3, warmup=3):
+        if method not in ('median', 'ema'):
+            raise ValueError(f"未知的稳定方法: {method}")
+        self.method = method
+        self.alpha = alpha
+        self.warmup = min(warmup, window)
+        self._window = deque(maxlen=window)
+        self._ema = None
+        self._count = 0
+
+    @property
+    def ready(self):
+        return self._count >= self.warmup
+
+    def update(self, rect):
+        """加入一帧的检测结果（未检测到时为 None），返回当前稳定矩形；预热前返回 None"""
+        if rect is not None:
+            self._count += 1
+            if self.method == 'median':
+                self._window.append(rect)
+            elif self._ema is None:
+                self._ema = np.asarray(rect, dtype=float)
+            else:
+                self._ema += self.alpha * (np.asarray(rect, dtype=float) - self._ema)
+        return self.current()
+
+    def current(self):
+        if not self.ready:
+            return None
+        if self.method == 'median':
+            # 使用中位数代替平均值提高鲁棒性
+            return tuple(int(v) for v in np.median(self._window, axis=0))
+        return tuple(int(v) for v in np.round(self._ema))
+
+
+def stable_rectangle_detection(video, stabilizer=None, show=True):
+    """
+    稳定矩形区域检测
+    传入 stabilizer 时每次只读取一帧并更新滑动窗口；
+    不传时沿用原有方式：采样 NUM_SAMPLES 帧后取中位数
+    """
+    if stabilizer is not None:
+        ret, frame = video.read()
+        if not ret:
+            return None, None
+        _, _, rect = find_chessboard(frame.copy())
+        return stabilizer.update(rect), frame
+
     samples = []
     for _ in range(NUM_SAMPLES):
         ret, frame = video.read()
@@ -93,9 +290,10 @@ def stable_rectangle_detection(video):
         _, _, rect = find_chessboard(frame.copy())
         if rect:
             samples.append(rect)
-            cv.imshow("Processing", frame)
-            if cv.waitKey(1) == ord('q'):
-                break
+            if show:
+                cv.imshow("Processing", frame)
+                if cv.waitKey(1) == ord('q'):
+                    break
 
     if not samples:
         return None, None
@@ -104,29 +302,372 @@ def stable_rectangle_detection(video):
     return tuple(np.median(samples, axis=0).astype(int)), frame
 
 
-def main():
-    cap = cv.VideoCapture(0)
-    if not cap.isOpened():
-        print("Error: Camera not accessible")
-        return
+# 棋盘状态变化事件：cell 为 (行, 列)，old/new 为变化前后的状态
+BoardEvent = namedtuple('BoardEvent', ['cell', 'old', 'new', 'timestamp'])
+
+
+def pack_state(state):
+    """把 3x3 状态矩阵打包为 9 位整数（第 i 行第 j 列对应第 3*i+j 位）"""
+    bits = np.asarray(state, dtype=np.int64).ravel() != 0
+    return int(np.dot(bits, 1 << np.arange(9)))
+
+
+def unpack_state(code):
+    """把 9 位整数还原为 3x3 状态矩阵"""
+    return ((code >> np.arange(9)) & 1).reshape(3, 3).astype(int)
+
+
+class BoardEventStream:
+    """
+    棋盘状态变化事件流：状态打包为 9 位整数，连续 debounce 帧相同才确认，
+    只在确认的状态发生变化时按格子发出 BoardEvent；初始确认状态相对空棋盘计算
+    """
+
+    def __init__(self, debounce=DEBOUNCE_FRAMES, callback=None):
+        self.debounce = debounce
+        self.callback = callback
+        self.confirmed = 0
+        self._candidate = None
+        self._count = 0
+
+    def update(self, state, timestamp=None):
+        """输入一帧的状态，返回本帧确认的事件列表（通常为空）"""
+        code = pack_state(state)
+        if code == self._candidate:
+            self._count += 1
+        else:
+            self._candidate, self._count = code, 1
+        if self._count < self.debounce or code == self.confirmed:
+            return []
+
+        timestamp = time.time() if timestamp is None else timestamp
+        changed = code ^ self.confirmed
+        events = [
+            BoardEvent(divmod(k, 3), (self.confirmed >> k) & 1, (code >> k) & 1, timestamp)
+            for k in range(9) if (changed >> k) & 1
+        ]
+        self.confirmed = code
+        if self.callback is not None:
+            for event in events:
+                self.callback(event)
+        return events
 
-    try:
-        while True:
-            rect, frame = stable_rectangle_detection(cap)
-            if not rect:
-                print("Chessboard not detected")
-                time.sleep(1)
-                continue
 
-            state_matrix = get_chess_state(frame, rect)
-            print("Current State:\n", state_matrix)
+def iter_board_events(states, debounce=DEBOUNCE_FRAMES):
+    """生成器接口：states 为 (时间戳, 状态矩阵) 序列，只产出状态变化事件"""
+    stream = BoardEventStream(debounce)
+    for timestamp, state in states:
+        yield from stream.update(state, timestamp)
 
+
+def print_event(event):
+    print(f"格子 {event.cell}: {event.old} -> {event.new}")
+
+
+class FrameBuffer:
+    """有界环形缓冲区：丢帧模式下满时丢弃最旧的帧，消费者总是拿到最新的帧"""
+
+    def __init__(self, size=BUFFER_SIZE, drop=True):
+        self._items = deque()
+        self._size = size
+        self._drop = drop
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            while not self._drop and len(self._items) >= self._size and not self._closed:
+                self._cond.wait()
+            if len(self._items) >= self._size:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """取出最早的一项；缓冲区已关闭且为空时返回 None"""
+        with self._cond:
+            while not self._items and not self._closed:
+                if not self._cond.wait(timeout):
+                    return None
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+class StageStats:
+    """单个处理阶段的帧率与延迟统计"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, latency):
+        with self._lock:
+            self.count += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self._start
+        fps = self.count / elapsed if elapsed > 0 else 0.0
+        avg = self.total_latency / self.count if self.count else 0.0
+        return (f"{self.name}: {self.count} 帧, {fps:.1f} FPS, "
+                f"平均延迟 {avg * 1000:.1f} ms, 最大延迟 {self.max_latency * 1000:.1f} ms")
+
+
+class ChessPipeline:
+    """
+    生产者/消费者流水线：采集线程 -> 环形缓冲区 -> 检测线程池 -> 主线程显示
+    HighGUI 不是线程安全的，窗口显示和 waitKey 只在主线程中调用
+    source 可为摄像头编号或视频文件路径；headless 为 True 时不创建窗口
+    """
+
+    def __init__(self, source=0, headless=False, num_workers=NUM_WORKERS, on_state=None, stabilizer=None,
+                 tracking=True):
+        self.source = source
+        self.headless = headless
+        self.num_workers = num_workers
+        # 默认只打印确认的状态变化事件，棋盘静止时不输出
+        self.events = BoardEventStream(callback=print_event)
+        self.on_state = on_state or (lambda index, state: self.events.update(state))
+        # 摄像头只保留最新帧；视频文件不丢帧，便于复现
+        self.frames = FrameBuffer(drop=isinstance(source, int))
+        self.display = FrameBuffer(size=1)
+        self.stabilizer = stabilizer or RectangleStabilizer()
+        # 跟踪模式：只在上一个棋盘位置附近搜索
+        self.tracker = BoardTracker() if tracking else None
+        self.stats = {name: StageStats(name) for name in ('capture', 'detect', 'state', 'display')}
+        self._stop = threading.Event()
+        self._error = None
+
+    def stop(self):
+        self._stop.set()
+
+    def _capture(self, cap):
+        """采集线程：读取帧并放入缓冲区"""
+        index = 0
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            self.stats['capture'].record(time.perf_counter() - start)
+            self.frames.put((index, time.perf_counter(), frame))
+            index += 1
+        self.frames.close()
+
+    def _detect(self, item):
+        """检测任务：在工作线程中寻找棋盘区域"""
+        index, captured, frame = item
+        start = time.perf_counter()
+        gray = to_gray(frame)
+        if self.tracker is not None:
+            rect = self.tracker.detect(frame, gray)
+        else:
+            _, _, rect = find_chessboard(frame, gray=gray, draw=False)
+        self.stats['detect'].record(time.perf_counter() - start)
+        return index, captured, frame, gray, rect
+
+    def _display(self):
+        """显示循环（在主线程中运行）：只显示最新的标注帧，按 q 退出"""
+        while not self._stop.is_set():
+            item = self.display.get(timeout=0.1)
+            if item is None:
+                continue
+            start = time.perf_counter()
+            cv.imshow("Chess Analysis", item)
             if cv.waitKey(1) == ord('q'):
+                self.stop()
+            self.stats['display'].record(time.perf_counter() - start)
+
+    def _process(self):
+        """处理线程：把缓冲区中的帧分发到检测线程池，按帧序更新状态；结束时停止流水线"""
+        pending = deque()
+        try:
+            with ThreadPoolExecutor(max_workers=self.num_workers) as pool:
+                while not self._stop.is_set():
+                    item = self.frames.get(timeout=0.1)
+                    if item is None:
+                        if self.frames.closed:
+                            break
+                        continue
+                    pending.append(pool.submit(self._detect, item))
+                    # 结果按帧序取出，最多同时排队两倍线程数的任务
+                    while pending and (pending[0].done() or len(pending) >= 2 * self.num_workers):
+                        self._analyze(pending.popleft().result())
+                while pending:
+                    self._analyze(pending.popleft().result())
+        except Exception as exc:
+            # 异常交给主线程在 run() 结束时重新抛出
+            self._error = exc
+        finally:
+            self.stop()
+
+    def _analyze(self, result):
+        """按帧序更新稳定矩形，预热后每帧计算一次状态"""
+        index, captured, frame, gray, rect = result
+        stable_rect = self.stabilizer.update(rect)
+        if stable_rect is None:
+            if rect is None:
+                print("Chessboard not detected")
+            return
+
+        state = get_chess_state(frame, stable_rect, show=False, gray=gray)
+        self.stats['state'].record(time.perf_counter() - captured)
+        self.on_state(index, state)
+        if not self.headless:
+            self.display.put(draw_chess_state(frame, stable_rect, state))
+
+    def run(self):
+        """运行流水线，直到视频结束或调用 stop()"""
+        cap = cv.VideoCapture(self.source)
+        if not cap.isOpened():
+            print("Error: Camera not accessible")
+            return
+
+        threads = [
+            threading.Thread(target=self._capture, args=(cap,), daemon=True),
+            threading.Thread(target=self._process, daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            if self.headless:
+                self._stop.wait()
+            else:
+                self._display()
+        finally:
+            self.stop()
+            self.frames.close()
+            for thread in threads:
+                thread.join()
+            cap.release()
+            if not self.headless:
+                cv.destroyAllWindows()
+        if self._error is not None:
+            raise self._error
+
+        print(f"丢弃帧数: {self.frames.dropped}")
+        if self.tracker is not None:
+            print(f"整帧搜索: {self.tracker.full_searches} 次, ROI 搜索: {self.tracker.roi_searches} 次")
+        for name, stats in self.stats.items():
+            if name != 'display' or not self.headless:
+                print(stats.summary())
+
+
+def analyze_frame(frame):
+    """单帧离线分析：检测棋盘并计算状态，返回 (矩形, 状态矩阵)；未检测到时均为 None"""
+    if isinstance(frame, str):
+        frame = cv.imread(frame)
+    gray = to_gray(frame)
+    _, _, rect = find_chessboard(frame, gray=gray, draw=False)
+    if rect is None:
+        return None, None
+    return rect, classify_cells(gray, rect)
+
+
+def iter_frames(source):
+    """
+    逐帧读取离线输入：source 为图片目录时按文件名顺序返回图片路径（由工作进程读取），
+    为视频文件时返回解码后的帧；每项为 (帧名, 帧或路径)
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield name, os.path.join(source, name)
+        return
+
+    cap = cv.VideoCapture(source)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"无法打开视频: {source}")
+    index = 0
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
                 break
+            yield str(index), frame
+            index += 1
     finally:
         cap.release()
-        cv.destroyAllWindows()
+
+
+def _frame_record(index, name, future):
+    """等待一帧的分析结果，返回该帧的 JSONL 行"""
+    rect, state = future.result()
+    record = {
+        'frame': index,
+        'name': name,
+        'rect': None if rect is None else [int(v) for v in rect],
+        'state': None if state is None else state.tolist(),
+    }
+    return json.dumps(record) + '\n'
+
+
+def process_offline(source, output_file, workers=None, max_pending=None):
+    """
+    离线批处理：把各帧提交到进程池，按帧序把每帧的状态矩阵写为 JSONL
+    同时在途的帧最多 max_pending 个（默认两倍进程数），边解码边写出，内存占用与视频长度无关
+    每行格式：{"frame": 序号, "name": 帧名, "rect": [x1, y1, x2, y2], "state": [[...], ...]}
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    pending = deque()
+    count = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(output_file, 'w', encoding='utf-8') as f:
+        for name, frame in iter_frames(source):
+            pending.append((name, pool.submit(analyze_frame, frame)))
+            # 窗口已满时先按帧序写出最早的一帧，再继续解码下一帧
+            if len(pending) >= max_pending:
+                f.write(_frame_record(count, *pending.popleft()))
+                count += 1
+        while pending:
+            f.write(_frame_record(count, *pending.popleft()))
+            count += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"已处理 {count} 帧，用时 {elapsed:.2f} s（{count / elapsed if elapsed else 0:.1f} FPS），结果已保存到 {output_file}")
+    return count
+
+
+def main(source=0, headless=False):
+    ChessPipeline(source, headless=headless).run()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="井字棋棋盘状态识别")
+    parser.add_argument('--source', default='0', help="摄像头编号、视频文件或（离线模式下）图片目录")
+    parser.add_argument('--headless', action='store_true', help="不创建窗口")
+    parser.add_argument('--offline', metavar='OUTPUT', help="离线批处理模式，把每帧状态写入该 JSONL 文件")
+    parser.add_argument('--workers', type=int, default=None, help="离线模式的进程数")
+    args = parser.parse_args(argv)
+    if args.source.isdigit():
+        args.source = int(args.source)
+    return args
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.offline:
+        process_offline(args.source, args.offline, workers=args.workers)
+    else:
+        main(args.source, headless=args.headless)
\ No newline at end of file